@@ -51,6 +51,7 @@ from .gsr_processing import (
     compute_gsr_features,
     process_gsr_pipeline,
     segment_by_events,
+    RealtimeSCRDetector,
 )
 
 from .bioradio import (
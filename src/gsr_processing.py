@@ -20,7 +20,9 @@ Updated: 2026
 
 import numpy as np
 import pandas as pd
+import scipy.fft
 from scipy import signal as scipy_signal
+from functools import lru_cache
 from typing import Optional, Tuple, Dict, List
 import warnings
 
@@ -53,8 +55,10 @@ def lowpass_filter(data: np.ndarray,
     Returns
     -------
     np.ndarray
-        Filtered signal
+        Filtered signal (float32)
     """
+    data = np.asarray(data)
+
     nyquist = sample_rate / 2
     normalized = cutoff_freq / nyquist
 
@@ -62,21 +66,102 @@ def lowpass_filter(data: np.ndarray,
         normalized = 0.99
         warnings.warn(f"Cutoff adjusted to {normalized * nyquist:.1f} Hz (Nyquist limit)")
 
-    b, a = scipy_signal.butter(order, normalized, btype='lowpass')
+    # The SOS stays float64: at low normalized cutoffs (e.g. 5 Hz at the
+    # BioRadio's 16 kHz) float32 coefficients make the sections unstable.
+    # Only the result is narrowed; GSR amplifiers resolve ~16 bits.
+    sos = scipy_signal.butter(order, normalized, btype='lowpass', output='sos')
 
-    if data.ndim == 1:
-        return scipy_signal.filtfilt(b, a, data)
-    else:
-        return np.apply_along_axis(lambda x: scipy_signal.filtfilt(b, a, x), 0, data)
+    # Filters every channel (column) in one compiled call for 2D input
+    return scipy_signal.sosfiltfilt(sos, data, axis=0).astype(np.float32)
 
 
 # ---------------------------------------------------------------------------
 # Tonic / Phasic Decomposition
 # ---------------------------------------------------------------------------
 
+def _neurokit_decompose(data: np.ndarray,
+                        sample_rate: float) -> Optional[Dict[str, np.ndarray]]:
+    """
+    Run neurokit2's EDA processing, returning None (with a warning) on failure.
+
+    nk.eda_process cleans the signal itself, so callers may pass raw data.
+    """
+    try:
+        import neurokit2 as nk
+        eda_signals, _info = nk.eda_process(data, sampling_rate=int(sample_rate))
+        return {
+            'tonic': eda_signals['EDA_Tonic'].values,
+            'phasic': eda_signals['EDA_Phasic'].values,
+            'cleaned': eda_signals['EDA_Clean'].values,
+        }
+    except ImportError:
+        warnings.warn("neurokit2 not available, falling back to highpass method")
+    except Exception as e:
+        warnings.warn(f"neurokit2 decomposition failed ({e}), falling back to highpass")
+    return None
+
+
+def _scr_kernel(sample_rate: float,
+                tau0: float = 2.0,
+                tau1: float = 0.7) -> np.ndarray:
+    """Bateman SCR impulse response (cvxEDA's default time constants), peak 1."""
+    t = np.arange(int(10 * tau0 * sample_rate)) / sample_rate
+    kernel = np.exp(-t / tau0) - np.exp(-t / tau1)
+    return kernel / kernel.max()
+
+
+def _fast_convex_decompose(data: np.ndarray,
+                           sample_rate: float,
+                           tonic_sos: np.ndarray,
+                           sparsity: float = 0.02,
+                           n_iter: int = 50) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Lightweight cvxEDA-style decomposition.
+
+    Models the signal as tonic + (SCR kernel * driver), with a sparse,
+    non-negative driver found by accelerated proximal gradient (FISTA) on
+    0.5 * ||data - tonic - K driver||^2 + lambda * ||driver||_1. Every 10
+    iterations the tonic is re-estimated as the 0.05 Hz lowpass of the
+    signal with the current SCRs removed.
+
+    Returns (tonic, phasic).
+    """
+    n = len(data)
+    kernel = _scr_kernel(sample_rate)
+    k_len = len(kernel)
+
+    def convolve(x):
+        return scipy_signal.oaconvolve(x, kernel)[:n]
+
+    def correlate(x):
+        return scipy_signal.oaconvolve(x, kernel[::-1])[k_len - 1:k_len - 1 + n]
+
+    # Step size 1/L, with L = (sum of kernel)^2 bounding the gradient's
+    # Lipschitz constant; lambda scales with the kernel so it is rate-independent
+    kernel_sum = kernel.sum()
+    step = 1.0 / kernel_sum ** 2
+    shrink = sparsity * kernel_sum * step
+
+    tonic = scipy_signal.sosfiltfilt(tonic_sos, data)
+    driver = np.zeros(n)
+    momentum_point = driver.copy()
+    t_k = 1.0
+    for i in range(n_iter):
+        gradient = correlate(convolve(momentum_point) + tonic - data)
+        updated = np.maximum(momentum_point - step * gradient - shrink, 0.0)
+        t_next = (1.0 + np.sqrt(1.0 + 4.0 * t_k * t_k)) / 2.0
+        momentum_point = updated + ((t_k - 1.0) / t_next) * (updated - driver)
+        driver, t_k = updated, t_next
+        if i % 10 == 9:
+            tonic = scipy_signal.sosfiltfilt(tonic_sos, data - convolve(driver))
+
+    return tonic, convolve(driver)
+
+
 def decompose_eda(data: np.ndarray,
                   sample_rate: float = 250.0,
-                  method: str = "highpass") -> Dict[str, np.ndarray]:
+                  method: str = "highpass",
+                  copy: bool = False) -> Dict[str, np.ndarray]:
     """
     Decompose EDA signal into tonic (SCL) and phasic (SCR) components.
 
@@ -84,8 +169,10 @@ def decompose_eda(data: np.ndarray,
     The phasic component (Skin Conductance Responses) contains rapid
     event-related responses driven by sympathetic nervous system activation.
 
-    Two methods available:
+    Three methods available:
     - "highpass": Simple highpass/lowpass split at 0.05 Hz (fast, transparent)
+    - "fast_convex": Sparse SCR deconvolution in the spirit of cvxEDA,
+      NumPy-only (no neurokit2 import or pandas round-trip)
     - "neurokit": Uses neurokit2's cvxEDA algorithm (research-grade)
 
     Parameters
@@ -95,7 +182,12 @@ def decompose_eda(data: np.ndarray,
     sample_rate : float
         Sampling rate in Hz
     method : str
-        Decomposition method ("highpass" or "neurokit")
+        Decomposition method ("highpass", "fast_convex" or "neurokit")
+    copy : bool
+        If True, the returned 'cleaned' signal is always a new array. By
+        default it is `data` converted to float32, which shares memory with a
+        float32 ndarray input (so callers that modify 'cleaned' in place
+        should pass copy=True); other dtypes are copied by the conversion.
 
     Returns
     -------
@@ -104,21 +196,12 @@ def decompose_eda(data: np.ndarray,
         'phasic': SCR component (np.ndarray)
         'cleaned': cleaned/filtered signal (np.ndarray)
     """
+    data = np.asarray(data, dtype=np.float32)
+
     if method == "neurokit":
-        try:
-            import neurokit2 as nk
-            eda_signals, _info = nk.eda_process(data, sampling_rate=int(sample_rate))
-            return {
-                'tonic': eda_signals['EDA_Tonic'].values,
-                'phasic': eda_signals['EDA_Phasic'].values,
-                'cleaned': eda_signals['EDA_Clean'].values,
-            }
-        except ImportError:
-            warnings.warn("neurokit2 not available, falling back to highpass method")
-            method = "highpass"
-        except Exception as e:
-            warnings.warn(f"neurokit2 decomposition failed ({e}), falling back to highpass")
-            method = "highpass"
+        components = _neurokit_decompose(data, sample_rate)
+        if components is not None:
+            return components
 
     # Simple highpass/lowpass decomposition
     # Tonic = very low frequency component (< 0.05 Hz)
@@ -128,13 +211,41 @@ def decompose_eda(data: np.ndarray,
     if cutoff >= 1.0:
         # Sample rate too low for this cutoff — return data as-is
         warnings.warn(f"Sample rate {sample_rate} Hz too low for 0.05 Hz decomposition cutoff")
-        return {'tonic': data.copy(), 'phasic': np.zeros_like(data), 'cleaned': data.copy()}
+        return {'tonic': data.copy(), 'phasic': np.zeros_like(data),
+                'cleaned': data.copy() if copy else data}
+
+    # Second-order sections: the (b, a) form is ill-conditioned this close to
+    # DC. The filter itself runs in float64 (its poles sit within 1e-3 of the
+    # unit circle, too close for float32); only the outputs are stored as float32.
+    sos = scipy_signal.butter(4, cutoff, btype='lowpass', output='sos')
+    if method == "fast_convex":
+        tonic, phasic = _fast_convex_decompose(data, sample_rate, sos)
+        tonic, phasic = tonic.astype(np.float32), phasic.astype(np.float32)
+    else:
+        tonic = scipy_signal.sosfiltfilt(sos, data).astype(np.float32)
+        phasic = data - tonic
+
+    return {'tonic': tonic, 'phasic': phasic, 'cleaned': data.copy() if copy else data}
 
-    b, a = scipy_signal.butter(4, cutoff, btype='lowpass')
-    tonic = scipy_signal.filtfilt(b, a, data)
-    phasic = data - tonic
 
-    return {'tonic': tonic, 'phasic': phasic, 'cleaned': data.copy()}
+def _filter_and_decompose(data: np.ndarray,
+                          sample_rate: float,
+                          method: str) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Filter and decompose raw GSR data, filtering only once.
+
+    The neurokit path cleans internally, so the explicit lowpass is only
+    applied for the other methods (or when neurokit is unavailable).
+    """
+    if method == "neurokit":
+        components = _neurokit_decompose(data, sample_rate)
+        if components is not None:
+            return components['cleaned'], components
+
+    if method == "neurokit":
+        method = "highpass"
+    filtered = lowpass_filter(data, sample_rate=sample_rate)
+    return filtered, decompose_eda(filtered, sample_rate, method=method)
 
 
 # ---------------------------------------------------------------------------
@@ -176,43 +287,185 @@ def detect_scr_peaks(phasic: np.ndarray,
     """
     min_distance = int(min_distance_sec * sample_rate)
 
-    peaks, properties = scipy_signal.find_peaks(
+    # Height/distance pruning first, then prominence on the survivors only
+    # (find_peaks applies the same filters in the same order).
+    peaks, _properties = scipy_signal.find_peaks(
         phasic,
         height=threshold,
         distance=min_distance,
-        prominence=threshold * 0.5
     )
+    if len(peaks) > 0:
+        prominences = scipy_signal.peak_prominences(phasic, peaks)[0]
+        peaks = peaks[prominences >= threshold * 0.5]
 
     amplitudes = phasic[peaks] if len(peaks) > 0 else np.array([])
 
-    # Find onsets (where phasic starts rising before each peak)
-    onsets = []
-    rise_times = []
-    for peak in peaks:
-        onset = peak
-        search_start = max(0, peak - int(5 * sample_rate))
-        for i in range(peak - 1, search_start, -1):
-            if phasic[i] <= 0 or phasic[i] >= phasic[i + 1]:
-                onset = i + 1
-                break
-        onsets.append(onset)
-        rise_times.append((peak - onset) / sample_rate)
+    # Find onsets (where phasic starts rising before each peak): the sample
+    # after the last non-rising or non-positive point within 5 s of the peak.
+    if len(peaks) > 0:
+        stops = np.flatnonzero((phasic[:-1] <= 0) | (phasic[:-1] >= phasic[1:]))
+        search_start = np.maximum(0, peaks - int(5 * sample_rate))
+        last_stop = np.searchsorted(stops, peaks) - 1
+        prev_stop = stops[np.maximum(last_stop, 0)] if len(stops) > 0 else peaks
+        found = (last_stop >= 0) & (prev_stop > search_start)
+        onsets = np.where(found, prev_stop + 1, peaks)
+        rise_times = (peaks - onsets) / sample_rate
+    else:
+        onsets = np.array([])
+        rise_times = np.array([])
 
     return {
         'peaks_idx': peaks,
         'amplitudes': amplitudes,
-        'rise_times': np.array(rise_times) if rise_times else np.array([]),
-        'onsets_idx': np.array(onsets) if onsets else np.array([]),
+        'rise_times': rise_times,
+        'onsets_idx': onsets,
     }
 
 
+class RealtimeSCRDetector:
+    """
+    Streaming SCR detector for live GSR data (e.g. pulled from an LSL inlet).
+
+    Each chunk is smoothed with a one-pole lowpass and split into tonic
+    (one-pole lowpass at 0.05 Hz) and phasic parts using scipy's lfilter,
+    with filter state carried between calls. A small hysteresis state
+    machine then walks the phasic samples: an onset is the minimum before
+    the signal rises by `hysteresis`, and a peak is confirmed as soon as the
+    signal falls `hysteresis` below its running maximum. Peaks whose rise
+    from onset is at least `threshold` are reported.
+
+    Example
+    -------
+    >>> detector = RealtimeSCRDetector(sample_rate=250)
+    >>> samples, timestamps = inlet.pull_chunk()
+    >>> for event in detector.push_chunk([s[0] for s in samples]):
+    ...     print(event['amplitude'], event['rise_time'])
+    """
+
+    def __init__(self,
+                 sample_rate: float = 250.0,
+                 threshold: float = 0.01,
+                 min_distance_sec: float = 1.0,
+                 hysteresis: Optional[float] = None,
+                 smooth_cutoff: float = 1.0,
+                 tonic_cutoff: float = 0.05):
+        self.sample_rate = sample_rate
+        self.threshold = threshold
+        self.min_distance = int(min_distance_sec * sample_rate)
+        # Same ratio as the prominence criterion in detect_scr_peaks
+        self.hysteresis = threshold * 0.5 if hysteresis is None else hysteresis
+        self._smooth_ba = self._one_pole(smooth_cutoff, sample_rate)
+        self._tonic_ba = self._one_pole(tonic_cutoff, sample_rate)
+        self.reset()
+
+    @staticmethod
+    def _one_pole(cutoff: float, sample_rate: float) -> Tuple[np.ndarray, np.ndarray]:
+        alpha = 1.0 - np.exp(-2.0 * np.pi * cutoff / sample_rate)
+        return np.array([alpha]), np.array([1.0, alpha - 1.0])
+
+    def reset(self):
+        """Forget all filter state and detection history."""
+        self._smooth_zi = None
+        self._tonic_zi = None
+        self._n = 0
+        self._seeking_peak = False
+        self._extreme = np.inf       # running min (seeking onset) or max (seeking peak)
+        self._extreme_idx = 0
+        self._onset = 0
+        self._onset_value = 0.0
+        self._last_peak = -self.min_distance
+
+    def push(self, sample: float) -> Optional[Dict]:
+        """Process one sample; return an SCR event dict if one was just confirmed."""
+        events = self.push_chunk(np.array([sample], dtype=np.float64))
+        return events[0] if events else None
+
+    def push_chunk(self, samples: np.ndarray) -> List[Dict]:
+        """
+        Process a chunk of consecutive GSR samples.
+
+        Returns
+        -------
+        list of dict
+            One entry per confirmed SCR with 'peak_idx', 'onset_idx' (sample
+            indices since the first sample pushed), 'amplitude' and
+            'rise_time' (seconds)
+        """
+        x = np.asarray(samples, dtype=np.float64)
+        if x.size == 0:
+            return []
+
+        if self._smooth_zi is None:
+            # Start both filters settled at the first value
+            self._smooth_zi = scipy_signal.lfilter_zi(*self._smooth_ba) * x[0]
+            self._tonic_zi = scipy_signal.lfilter_zi(*self._tonic_ba) * x[0]
+
+        smooth, self._smooth_zi = scipy_signal.lfilter(*self._smooth_ba, x,
+                                                       zi=self._smooth_zi)
+        tonic, self._tonic_zi = scipy_signal.lfilter(*self._tonic_ba, smooth,
+                                                     zi=self._tonic_zi)
+        phasic = (smooth - tonic).tolist()
+
+        events = []
+        seeking_peak = self._seeking_peak
+        extreme, extreme_idx = self._extreme, self._extreme_idx
+        hysteresis = self.hysteresis
+        idx = self._n
+        for value in phasic:
+            if seeking_peak:
+                if value > extreme:
+                    extreme, extreme_idx = value, idx
+                elif value < extreme - hysteresis:
+                    amplitude = extreme - self._onset_value
+                    if (amplitude >= self.threshold
+                            and extreme_idx - self._last_peak >= self.min_distance):
+                        events.append({
+                            'peak_idx': extreme_idx,
+                            'onset_idx': self._onset,
+                            'amplitude': amplitude,
+                            'rise_time': (extreme_idx - self._onset) / self.sample_rate,
+                        })
+                        self._last_peak = extreme_idx
+                    seeking_peak = False
+                    extreme, extreme_idx = value, idx
+            else:
+                if value < extreme:
+                    extreme, extreme_idx = value, idx
+                elif value > extreme + hysteresis:
+                    self._onset, self._onset_value = extreme_idx, extreme
+                    seeking_peak = True
+                    extreme, extreme_idx = value, idx
+            idx += 1
+
+        self._seeking_peak = seeking_peak
+        self._extreme, self._extreme_idx = extreme, extreme_idx
+        self._n = idx
+        return events
+
+
 # ---------------------------------------------------------------------------
 # Feature Extraction
 # ---------------------------------------------------------------------------
 
+def _tonic_stats(tonic: np.ndarray) -> Tuple[float, float, float, float]:
+    """
+    Return (mean, std, min, max) of the tonic component.
+
+    The std reuses the already-computed mean and a BLAS dot product instead
+    of np.std's own mean/square/sum passes over the array. Centering first
+    keeps the float32 sum of squares free of cancellation; results are
+    returned as float64.
+    """
+    mean = tonic.mean(dtype=np.float64)
+    centered = tonic - tonic.dtype.type(mean)
+    std = np.sqrt(np.dot(centered, centered) / tonic.size, dtype=np.float64)
+    return mean, std, np.float64(tonic.min()), np.float64(tonic.max())
+
+
 def compute_gsr_features(data: np.ndarray,
                          sample_rate: float = 250.0,
-                         condition: str = "") -> Dict:
+                         condition: str = "",
+                         method: str = "neurokit") -> Dict:
     """
     Extract GSR features from a segment of data (e.g., one experimental condition).
 
@@ -226,6 +479,9 @@ def compute_gsr_features(data: np.ndarray,
         Sampling rate in Hz
     condition : str
         Optional label for this condition window
+    method : str
+        Decomposition method ("neurokit", "fast_convex" or "highpass",
+        see decompose_eda)
 
     Returns
     -------
@@ -238,17 +494,12 @@ def compute_gsr_features(data: np.ndarray,
     if condition:
         features['condition'] = condition
 
-    # Filter
-    filtered = lowpass_filter(data, sample_rate=sample_rate)
-
-    # Decompose
-    components = decompose_eda(filtered, sample_rate, method="neurokit")
+    # Filter + decompose (neurokit cleans internally, so no separate lowpass)
+    _filtered, components = _filter_and_decompose(data, sample_rate, method)
 
     # Tonic features (SCL)
-    features['scl_mean'] = np.mean(components['tonic'])
-    features['scl_std'] = np.std(components['tonic'])
-    features['scl_min'] = np.min(components['tonic'])
-    features['scl_max'] = np.max(components['tonic'])
+    (features['scl_mean'], features['scl_std'],
+     features['scl_min'], features['scl_max']) = _tonic_stats(components['tonic'])
     features['scl_range'] = features['scl_max'] - features['scl_min']
 
     # Phasic features (SCR)
@@ -259,8 +510,8 @@ def compute_gsr_features(data: np.ndarray,
     features['scr_rate'] = features['scr_count'] / duration_min if duration_min > 0 else 0
 
     if len(scr['amplitudes']) > 0:
-        features['scr_amp_mean'] = np.mean(scr['amplitudes'])
-        features['scr_amp_max'] = np.max(scr['amplitudes'])
+        features['scr_amp_mean'] = np.mean(scr['amplitudes'], dtype=np.float64)
+        features['scr_amp_max'] = np.float64(np.max(scr['amplitudes']))
         features['scr_rise_time_mean'] = np.mean(scr['rise_times'])
     else:
         features['scr_amp_mean'] = 0.0
@@ -274,6 +525,14 @@ def compute_gsr_features(data: np.ndarray,
 # Power Spectral Density
 # ---------------------------------------------------------------------------
 
+@lru_cache(maxsize=8)
+def _hann_window(nperseg: int) -> np.ndarray:
+    """Welch window for a given segment length, built once per length."""
+    window = scipy_signal.get_window('hann', nperseg).astype(np.float32)
+    window.flags.writeable = False
+    return window
+
+
 def power_spectral_density(data: np.ndarray,
                            sample_rate: float = 250.0,
                            nperseg: int = 1024) -> Tuple[np.ndarray, np.ndarray]:
@@ -287,7 +546,8 @@ def power_spectral_density(data: np.ndarray,
     sample_rate : float
         Sampling rate in Hz
     nperseg : int
-        Length of each segment for Welch's method
+        Length of each segment for Welch's method (rounded down to a power
+        of two for the FFT)
 
     Returns
     -------
@@ -296,8 +556,12 @@ def power_spectral_density(data: np.ndarray,
     psd : np.ndarray
         Power spectral density values
     """
-    freqs, psd = scipy_signal.welch(data, fs=sample_rate,
-                                     nperseg=min(nperseg, len(data)))
+    data = np.asarray(data, dtype=np.float32)
+    nperseg = 1 << int(np.log2(min(nperseg, len(data))))
+    with scipy.fft.set_workers(-1):
+        freqs, psd = scipy_signal.welch(data, fs=sample_rate,
+                                         window=_hann_window(nperseg),
+                                         nperseg=nperseg)
     return freqs, psd
 
 
@@ -306,7 +570,9 @@ def power_spectral_density(data: np.ndarray,
 # ---------------------------------------------------------------------------
 
 def process_gsr_pipeline(data: np.ndarray,
-                         sample_rate: float = 250.0) -> Dict:
+                         sample_rate: float = 250.0,
+                         method: str = "neurokit",
+                         copy: bool = False) -> Dict:
     """
     Complete GSR processing pipeline.
     Analogous to process_emg_pipeline() in emg_processing.py.
@@ -319,21 +585,24 @@ def process_gsr_pipeline(data: np.ndarray,
         Raw GSR signal
     sample_rate : float
         Sampling rate in Hz
+    method : str
+        Decomposition method ("neurokit", "fast_convex" or "highpass",
+        see decompose_eda)
+    copy : bool
+        If True, 'raw' is a copy of `data` rather than `data` itself
 
     Returns
     -------
     dict
         'raw': original signal
-        'filtered': low-pass filtered
+        'filtered': low-pass filtered (neurokit's cleaned signal for "neurokit")
         'tonic': SCL component
         'phasic': SCR component
         'scr_peaks': detected SCR peak info dict
     """
-    result = {'raw': data.copy()}
+    result = {'raw': data.copy() if copy else data}
 
-    result['filtered'] = lowpass_filter(data, sample_rate=sample_rate)
-
-    components = decompose_eda(result['filtered'], sample_rate, method="neurokit")
+    result['filtered'], components = _filter_and_decompose(data, sample_rate, method)
     result['tonic'] = components['tonic']
     result['phasic'] = components['phasic']
 
@@ -357,19 +626,25 @@ def segment_by_events(data: np.ndarray,
     data : np.ndarray
         GSR signal
     timestamps : np.ndarray
-        Timestamp for each sample
+        Timestamp for each sample (ascending, as recorded by LSL)
     events : list of (start_time, end_time, label)
-        Condition windows
+        Condition windows (inclusive at both ends)
 
     Returns
     -------
     dict
-        label -> data array for each condition
+        label -> data array for each condition (views into `data`)
     """
+    timestamps = np.asarray(timestamps)
+    if np.any(timestamps[1:] < timestamps[:-1]):
+        order = np.argsort(timestamps, kind='stable')
+        data, timestamps = data[order], timestamps[order]
+
     segments = {}
     for start, end, label in events:
-        mask = (timestamps >= start) & (timestamps <= end)
-        segments[label] = data[mask]
+        i0 = np.searchsorted(timestamps, start, side='left')
+        i1 = np.searchsorted(timestamps, end, side='right')
+        segments[label] = data[i0:i1]
     return segments
 
 
@@ -393,19 +668,21 @@ if __name__ == "__main__":
     # Phasic component: simulated SCR events
     phasic = np.zeros(n)
     scr_times = [10, 25, 42, 55, 68, 80, 95, 105]  # seconds
+    # SCR shape: fast rise (~2s), slow decay (~5s)
+    rise_samples = int(2.0 * sample_rate)
+    decay_samples = int(5.0 * sample_rate)
+    rise_kernel = np.arange(rise_samples) / rise_samples
+    decay_kernel = np.exp(-np.arange(decay_samples) / (1.5 * sample_rate))
     for scr_t in scr_times:
         idx = int(scr_t * sample_rate)
         if idx < n:
-            # SCR shape: fast rise (~2s), slow decay (~5s)
-            rise_samples = int(2.0 * sample_rate)
-            decay_samples = int(5.0 * sample_rate)
             amplitude = 0.3 + np.random.rand() * 0.5
 
-            for j in range(min(rise_samples, n - idx)):
-                phasic[idx + j] += amplitude * (j / rise_samples)
+            rise = rise_kernel[:n - idx]
+            phasic[idx:idx + len(rise)] += amplitude * rise
             peak_idx = min(idx + rise_samples, n - 1)
-            for j in range(min(decay_samples, n - peak_idx)):
-                phasic[peak_idx + j] += amplitude * np.exp(-j / (1.5 * sample_rate))
+            decay = decay_kernel[:n - peak_idx]
+            phasic[peak_idx:peak_idx + len(decay)] += amplitude * decay
 
     # Combine + add noise
     raw_gsr = tonic + phasic + np.random.randn(n) * 0.02
@@ -18,7 +18,7 @@ Updated: 2025
 
 import time
 import threading
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 from typing import Optional, Callable
 from pathlib import Path
 from datetime import datetime
@@ -52,6 +52,54 @@ def _resolve_byprop(prop: str, value: str, minimum: int = 1, timeout: float = 5.
         return pylsl.resolve_byprop(prop, value, minimum=minimum, timeout=timeout)
 
 
+# Initial per-stream buffer size (samples); doubled whenever it fills up.
+_INITIAL_CAPACITY = 4096
+# Maximum samples fetched per pull_chunk call.
+_CHUNK_SAMPLES = 1024
+
+
+def _buffer_dtype(info: pylsl.StreamInfo) -> np.dtype:
+    """
+    Pick the NumPy dtype used to buffer samples from a pylsl stream.
+
+    Numeric dtypes match pylsl's ctypes value type so pull_chunk can write
+    into the buffer directly; string (marker) streams use object arrays.
+    """
+    dtypes = {
+        pylsl.cf_float32: np.float32,
+        pylsl.cf_double64: np.float64,
+        pylsl.cf_int8: np.int8,
+        pylsl.cf_int16: np.int16,
+        pylsl.cf_int32: np.int32,
+        pylsl.cf_int64: np.int64,
+    }
+    return np.dtype(dtypes.get(info.channel_format(), object))
+
+
+# Parsed StreamInfo keyed by (source_id, uid), so repeated lookups of the
+# same stream skip walking the XML description through the C API.
+_stream_info_cache: dict[tuple[str, str], "StreamInfo"] = {}
+
+
+def _samples_to_dataframe(timestamps: np.ndarray, data: np.ndarray,
+                          channel_names: list[str], copy: bool = True) -> pd.DataFrame:
+    """
+    Build a 'timestamp' + channel DataFrame in one construction.
+    
+    Avoids DataFrame.insert(0, ...), which reallocates every column. With
+    copy=False the columns may be views of `data`.
+    """
+    columns = {'timestamp': timestamps}
+    columns.update((name, data[:, i]) for i, name in enumerate(channel_names))
+    if len(columns) == len(channel_names) + 1:
+        return pd.DataFrame(columns, copy=copy)
+    
+    # Duplicate channel labels can't be dict keys; fall back to insert
+    df = pd.DataFrame(data, columns=channel_names, copy=copy)
+    df.insert(0, 'timestamp', timestamps)
+    return df
+
+
 @dataclass
 class StreamInfo:
     """Information about an LSL stream."""
@@ -66,36 +114,42 @@ class StreamInfo:
     @classmethod
     def from_pylsl(cls, info: pylsl.StreamInfo) -> "StreamInfo":
         """Create StreamInfo from pylsl.StreamInfo object."""
+        key = (info.source_id(), info.uid())
+        cached = _stream_info_cache.get(key)
+        if cached is not None:
+            return replace(cached, channel_names=list(cached.channel_names))
+        
+        channel_count = info.channel_count()
+        
         # Extract channel names if available
         channel_names = []
         try:
-            desc = info.desc()
-            channels = desc.child("channels")
+            channels = info.desc().child("channels")
             if not channels.empty():
                 ch = channels.child("channel")
-                while not ch.empty():
+                while not ch.empty() and len(channel_names) < channel_count:
                     label = ch.child_value("label")
-                    if label:
-                        channel_names.append(label)
-                    else:
-                        channel_names.append(f"ch_{len(channel_names)+1}")
+                    channel_names.append(label or f"ch_{len(channel_names)+1}")
                     ch = ch.next_sibling("channel")
         except Exception:
             pass
         
         # Fill in default channel names if needed
-        while len(channel_names) < info.channel_count():
-            channel_names.append(f"ch_{len(channel_names)+1}")
+        channel_names.extend(f"ch_{i+1}"
+                             for i in range(len(channel_names), channel_count))
         
-        return cls(
+        result = cls(
             name=info.name(),
             type=info.type(),
-            channel_count=info.channel_count(),
+            channel_count=channel_count,
             sampling_rate=info.nominal_srate(),
-            source_id=info.source_id(),
+            source_id=key[0],
             hostname=info.hostname(),
             channel_names=channel_names
         )
+        if key[1]:  # uid is only assigned once the stream is on the network
+            _stream_info_cache[key] = result
+        return replace(result, channel_names=list(channel_names))
     
     def __str__(self) -> str:
         return (f"Stream: {self.name} ({self.type})\n"
@@ -194,10 +248,23 @@ class LSLRecorder:
     
     def __init__(self):
         self.inlets: list[tuple[pylsl.StreamInlet, StreamInfo]] = []
-        self.data: dict[str, list] = {}
-        self.timestamps: dict[str, list] = {}
+        # Preallocated (capacity x channels) sample buffers and timestamps;
+        # only the first self._counts[name] rows are valid.
+        self._data: dict[str, np.ndarray] = {}
+        self._timestamps: dict[str, np.ndarray] = {}
+        self._counts: dict[str, int] = {}
         self._recording = False
-        self._threads: list[threading.Thread] = []
+        self._thread: Optional[threading.Thread] = None
+    
+    @property
+    def data(self) -> dict[str, np.ndarray]:
+        """Recorded samples per stream name (views of the valid rows only)."""
+        return {name: buf[:self._counts[name]] for name, buf in self._data.items()}
+    
+    @property
+    def timestamps(self) -> dict[str, np.ndarray]:
+        """LSL timestamps per stream name (views of the valid rows only)."""
+        return {name: buf[:self._counts[name]] for name, buf in self._timestamps.items()}
     
     def add_stream(self, name: str = None, stream_type: str = None, 
                    timeout: float = 5.0) -> bool:
@@ -236,8 +303,10 @@ class LSLRecorder:
         inlet = pylsl.StreamInlet(streams[0], max_buflen=360)
         
         self.inlets.append((inlet, info))
-        self.data[info.name] = []
-        self.timestamps[info.name] = []
+        self._data[info.name] = np.empty((_INITIAL_CAPACITY, info.channel_count),
+                                        dtype=_buffer_dtype(streams[0]))
+        self._timestamps[info.name] = np.empty(_INITIAL_CAPACITY, dtype=np.float64)
+        self._counts[info.name] = 0
         
         print(f"Added stream: {info.name} ({info.channel_count} channels)")
         return True
@@ -254,28 +323,69 @@ class LSLRecorder:
         
         self._recording = True
         
-        # Start a recording thread for each inlet
-        for inlet, info in self.inlets:
-            thread = threading.Thread(
-                target=self._record_stream,
-                args=(inlet, info),
-                daemon=True
-            )
-            thread.start()
-            self._threads.append(thread)
+        # One thread services every inlet, so streams don't contend for the GIL
+        self._thread = threading.Thread(target=self._record_all, daemon=True)
+        self._thread.start()
         
         print("Recording started. Press Ctrl+C or call stop() to end.")
     
-    def _record_stream(self, inlet: pylsl.StreamInlet, info: StreamInfo):
-        """Internal method to record from a single stream."""
+    def _reserve(self, name: str, n_new: int):
+        """Ensure the buffers for `name` can hold n_new more samples."""
+        needed = self._counts[name] + n_new
+        capacity = len(self._timestamps[name])
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        n = self._counts[name]
+        data = np.empty((capacity, self._data[name].shape[1]), dtype=self._data[name].dtype)
+        data[:n] = self._data[name][:n]
+        timestamps = np.empty(capacity, dtype=np.float64)
+        timestamps[:n] = self._timestamps[name][:n]
+        self._data[name] = data
+        self._timestamps[name] = timestamps
+
+    def _pull_into_buffer(self, inlet: pylsl.StreamInlet, info: StreamInfo,
+                          timeout: float) -> int:
+        """Pull one chunk from `inlet` into its buffer; return samples read."""
+        name = info.name
+        self._reserve(name, _CHUNK_SAMPLES)
+        n = self._counts[name]
+
+        if self._data[name].dtype == object:
+            samples, timestamps = inlet.pull_chunk(timeout=timeout,
+                                                   max_samples=_CHUNK_SAMPLES)
+            n_new = len(timestamps)
+            if n_new:
+                self._data[name][n:n + n_new] = samples
+        else:
+            # Let pylsl write straight into the free rows of the buffer
+            _, timestamps = inlet.pull_chunk(timeout=timeout,
+                                             max_samples=_CHUNK_SAMPLES,
+                                             dest_obj=self._data[name][n:n + _CHUNK_SAMPLES])
+            n_new = len(timestamps)
+
+        if n_new:
+            self._timestamps[name][n:n + n_new] = timestamps
+            self._counts[name] = n + n_new
+        return n_new
+
+    def _record_all(self):
+        """Internal method to round-robin non-blocking pulls over all inlets."""
+        # An inlet that fails (e.g. its stream was lost) is reported once and
+        # dropped from the poll; its samples so far are kept
+        active = list(self.inlets)
         while self._recording:
-            try:
-                samples, timestamps = inlet.pull_chunk(timeout=0.1)
-                if samples:
-                    self.data[info.name].extend(samples)
-                    self.timestamps[info.name].extend(timestamps)
-            except Exception as e:
-                print(f"Error recording {info.name}: {e}")
+            pulled = 0
+            for entry in list(active):
+                inlet, info = entry
+                try:
+                    pulled += self._pull_into_buffer(inlet, info, timeout=0.0)
+                except Exception as e:
+                    print(f"Error recording {info.name}: {e} (no longer recording it)")
+                    active.remove(entry)
+            if not pulled:
+                time.sleep(0.005)
     
     def stop(self) -> dict[str, pd.DataFrame]:
         """
@@ -288,20 +398,19 @@ class LSLRecorder:
         """
         self._recording = False
         
-        # Wait for threads to finish
-        for thread in self._threads:
-            thread.join(timeout=1.0)
-        self._threads.clear()
+        # Wait for the recording thread to finish
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
         
         # Convert to DataFrames
         results = {}
         for inlet, info in self.inlets:
-            if self.data[info.name]:
-                df = pd.DataFrame(
-                    self.data[info.name],
-                    columns=info.channel_names
-                )
-                df.insert(0, 'timestamp', self.timestamps[info.name])
+            n = self._counts[info.name]
+            if n:
+                df = _samples_to_dataframe(self._timestamps[info.name][:n],
+                                           self._data[info.name][:n],
+                                           info.channel_names)
                 results[info.name] = df
                 print(f"Recorded {len(df)} samples from {info.name}")
         
@@ -309,7 +418,10 @@ class LSLRecorder:
     
     def save(self, filepath: str, stream_name: str = None):
         """
-        Save recorded data to a CSV file.
+        Save recorded data to a CSV or Parquet file.
+        
+        Files ending in ``.parquet`` are written column-by-column with pyarrow
+        (zstd-compressed); anything else is written as CSV.
         
         Parameters
         ----------
@@ -318,35 +430,44 @@ class LSLRecorder:
         stream_name : str, optional
             Which stream to save (if multiple). Saves first if not specified.
         """
-        if not self.data:
+        if not self._data:
             print("No data to save!")
             return
         
         # Get the data to save
         if stream_name:
-            if stream_name not in self.data:
+            if stream_name not in self._data:
                 print(f"Stream '{stream_name}' not found")
                 return
-            data = self.data[stream_name]
-            timestamps = self.timestamps[stream_name]
             info = next(i for _, i in self.inlets if i.name == stream_name)
         else:
             # Use first stream
             _, info = self.inlets[0]
-            data = self.data[info.name]
-            timestamps = self.timestamps[info.name]
+        n = self._counts[info.name]
+        data = self._data[info.name][:n]
+        timestamps = self._timestamps[info.name][:n]
+        
+        if Path(filepath).suffix.lower() == '.parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            
+            table = pa.Table.from_arrays(
+                [pa.array(timestamps)] + [pa.array(data[:, i]) for i in range(data.shape[1])],
+                names=['timestamp', *info.channel_names]
+            )
+            pq.write_table(table, filepath, compression='zstd')
+            print(f"Saved {n} samples to {filepath}")
+            return
         
         # Create DataFrame and save
-        df = pd.DataFrame(data, columns=info.channel_names)
-        df.insert(0, 'timestamp', timestamps)
+        df = _samples_to_dataframe(timestamps, data, info.channel_names, copy=False)
         df.to_csv(filepath, index=False)
         print(f"Saved {len(df)} samples to {filepath}")
     
     def clear(self):
         """Clear all recorded data."""
-        for name in self.data:
-            self.data[name].clear()
-            self.timestamps[name].clear()
+        for name in self._data:
+            self._counts[name] = 0
 
 
 class LSLMarkerStream:
@@ -407,17 +528,21 @@ def load_xdf(filepath: str) -> dict[str, pd.DataFrame]:
     for stream in data:
         name = stream['info']['name'][0]
         
+        # String (marker) streams come back as nested lists
+        time_series = np.asarray(stream['time_series'])
+        if time_series.ndim == 1:
+            time_series = time_series[:, np.newaxis]
+        
         # Get channel names
         try:
             channels = stream['info']['desc'][0]['channels'][0]['channel']
             col_names = [ch['label'][0] for ch in channels]
         except (KeyError, IndexError, TypeError):
-            col_names = [f'ch_{i}' for i in range(stream['time_series'].shape[1])]
+            col_names = [f'ch_{i}' for i in range(time_series.shape[1])]
         
         # Create DataFrame
-        df = pd.DataFrame(stream['time_series'], columns=col_names)
-        df.insert(0, 'timestamp', stream['time_stamps'])
-        results[name] = df
+        results[name] = _samples_to_dataframe(stream['time_stamps'], time_series,
+                                              col_names, copy=False)
     
     return results
 
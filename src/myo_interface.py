@@ -20,6 +20,9 @@ Requirements:
     
     # For pyomyo (fallback):
     pip install git+https://github.com/PerlinWarp/pyomyo.git
+    
+    # Optional, faster event loop for dl-myo (Linux/macOS):
+    pip install uvloop
 
 IMPORTANT: Close MyoConnect before running!
 
@@ -31,13 +34,20 @@ import sys
 import os
 import time
 import asyncio
+import importlib.util
 import threading
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
-from typing import Optional, List
-from queue import Queue
+from operator import attrgetter
+from typing import Optional, List, Dict, Tuple, Callable
+from collections import deque
+from contextlib import aclosing
 
 import numpy as np
 
+logger = logging.getLogger(__name__)
+
 try:
     import pylsl
     HAS_LSL = True
@@ -45,28 +55,56 @@ except ImportError:
     HAS_LSL = False
     print("Warning: pylsl not available. Install with: pip install pylsl")
 
-# Try to import dl-myo (native bluetooth, no dongle)
-HAS_DLMYO = False
+# dl-myo and bleak load the platform Bluetooth stack (D-Bus, WinRT, ...),
+# which --mock, --list-ports and plain imports never need. Only check that
+# they are installed here; they are imported on first use.
+
+# dl-myo (native bluetooth, no dongle)
+HAS_DLMYO = importlib.util.find_spec("myo") is not None
 DLMyoClient = None
 EMGMode = None
 IMUMode = None
 ClassifierMode = None
 
+
+def _load_dlmyo():
+    """Import dl-myo on first use and bind its client and mode enums."""
+    global DLMyoClient, EMGMode, IMUMode, ClassifierMode
+    if DLMyoClient is None:
+        from myo import MyoClient
+        from myo.types import EMGMode, IMUMode, ClassifierMode
+        DLMyoClient = MyoClient
+    return DLMyoClient
+
+
+# bleak for scanning (can work without full dl-myo)
+HAS_BLEAK = importlib.util.find_spec("bleak") is not None
+
+# bleak.exc doesn't pull in a Bluetooth backend, so it's safe to import here
 try:
-    from myo import MyoClient
-    from myo.types import EMGMode, IMUMode, ClassifierMode, EMGData
-    DLMyoClient = MyoClient
-    HAS_DLMYO = True
+    from bleak.exc import BleakError
 except ImportError:
-    pass
+    BleakError = None
 
-# Try to import bleak for scanning (can work without full dl-myo)
-HAS_BLEAK = False
-try:
+
+def _get_bleak():
+    """Import bleak on first use."""
     import bleak
-    HAS_BLEAK = True
+    return bleak
+
+# Shared Myo scan (myo_scan.py); importing it doesn't load bleak
+try:
+    from .myo_scan import MYO_SERVICE_UUID, MYO_COMMAND_UUID, iter_myos
 except ImportError:
-    pass
+    from myo_scan import MYO_SERVICE_UUID, MYO_COMMAND_UUID, iter_myos
+
+# Prompts in interactive_select must not block the event loop; aioconsole
+# reads stdin asynchronously, otherwise input() runs on a worker thread
+try:
+    from aioconsole import ainput
+except ImportError:
+    async def ainput(prompt: str = "") -> str:
+        return await asyncio.to_thread(input, prompt)
 
 # Try to import pyomyo (dongle-based)
 HAS_PYOMYO = False
@@ -93,6 +131,107 @@ if not HAS_DLMYO and not HAS_PYOMYO:
 # dl-myo Backend (Native Bluetooth - No Dongle)
 # ============================================================================
 
+# IMU extractors keyed by the sample's class, built from its first instance.
+# dl-myo's schema is fixed per class, so steady state is one dict lookup.
+_EXTRACTORS: Dict[type, Callable] = {}
+
+# IMU sample layout: (buffer slice, candidate attribute names, component
+# names) for quaternion, accelerometer and gyroscope
+_IMU_GROUPS = (
+    (slice(0, 4), ('orientation', 'quat'), ('w', 'x', 'y', 'z')),
+    (slice(4, 7), ('accelerometer', 'accel'), ('x', 'y', 'z')),
+    (slice(7, 10), ('gyroscope', 'gyro'), ('x', 'y', 'z')),
+)
+
+# Sample used for fields the IMU object doesn't provide: identity
+# orientation, zero acceleration and rotation
+_IMU_DEFAULT = np.array([1.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0], dtype=np.float32)
+
+
+def _build_imu_extractor(imu) -> Callable:
+    """
+    Inspect one IMU sample and return extract(imu, buf) for that layout.
+    
+    The IMU object schema is fixed for a connection, so the attribute probing
+    is done once and every field that is present is folded into a single
+    operator.attrgetter (e.g. 'orientation.w', ..., 'accelerometer'), which
+    fetches them all in one C call. extract() then copies [quat_w, quat_x,
+    quat_y, quat_z, accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z] into
+    the 10-element buf directly. Missing fields are filled from _IMU_DEFAULT.
+    """
+    paths = []
+    plan = []  # (buf slice, first index into the getter tuple, vector length or None)
+    for sl, names, components in _IMU_GROUPS:
+        name = next((n for n in names if hasattr(imu, n)), None)
+        value = getattr(imu, name) if name else None
+        if value is not None and hasattr(value, components[0]):
+            plan.append((sl, len(paths), None))
+            paths.extend(f"{name}.{c}" for c in components)
+        elif value is not None and hasattr(value, '__getitem__'):
+            plan.append((sl, len(paths), len(components)))
+            paths.append(name)
+    
+    if not paths:
+        def extract(imu, buf):
+            np.copyto(buf, _IMU_DEFAULT)
+        return extract
+    
+    get = attrgetter(*paths)
+    if len(paths) == 10:
+        # Every field is a scalar attribute: the getter tuple is the sample
+        def extract(imu, buf):
+            buf[:] = get(imu)
+        return extract
+    
+    if len(paths) == 1:
+        single = get
+        get = lambda imu: (single(imu),)
+    
+    partial = len(plan) < len(_IMU_GROUPS)
+    
+    def extract(imu, buf):
+        vals = get(imu)
+        if partial:
+            np.copyto(buf, _IMU_DEFAULT)
+        for sl, i, n in plan:
+            if n is None:
+                buf[sl] = vals[i:i + sl.stop - sl.start]
+            else:
+                buf[sl] = vals[i][:n]
+    
+    return extract
+
+
+# Channel metadata as (labels, unit, type) groups, written by _describe_outlet
+_EMG_LABELS = tuple(f"EMG_{i+1}" for i in range(8))
+_IMU_CHANNELS = (
+    (("quat_w", "quat_x", "quat_y", "quat_z"), "normalized", "Orientation"),
+    (("accel_x", "accel_y", "accel_z"), "g", "Accelerometer"),
+    (("gyro_x", "gyro_y", "gyro_z"), "deg/s", "Gyroscope"),
+)
+
+
+def _describe_outlet(info, backend: str, channel_groups) -> None:
+    """
+    Fill info.desc() with the device metadata and one <channel> per label.
+    
+    channel_groups is a sequence of (labels, unit, type); a unit or type of
+    None is left out of the channel entries.
+    """
+    desc = info.desc()
+    desc.append_child_value("manufacturer", "Thalmic Labs")
+    desc.append_child_value("backend", backend)
+    channels = desc.append_child("channels")
+    for labels, unit, ch_type in channel_groups:
+        for label in labels:
+            ch = channels.append_child("channel")
+            ch.append_child_value("label", label)
+            if unit is not None:
+                ch.append_child_value("unit", unit)
+            if ch_type is not None:
+                ch.append_child_value("type", ch_type)
+
+
 class DLMyoStreamer:
     """
     Streams Myo data using dl-myo (native Bluetooth).
@@ -103,8 +242,13 @@ class DLMyoStreamer:
     Streams:
     - EMG: 8 channels at 200Hz (raw/filtered) or 50Hz (preprocessed)
     - IMU: 10 channels at 50Hz (orientation quaternion + accelerometer + gyroscope)
+    
+    The latest IMU samples are also kept in memory; see get_recent().
     """
     
+    # IMU samples kept for get_recent() (~10 s at 50 Hz)
+    _IMU_RING = 512
+    
     def __init__(self, stream_name: str = "Myo", mac: str = None, mode: str = "raw",
                  enable_imu: bool = True):
         if not HAS_DLMYO:
@@ -112,6 +256,7 @@ class DLMyoStreamer:
                 "dl-myo not available.\n"
                 "Install with: pip install dl-myo"
             )
+        _load_dlmyo()
         if not HAS_LSL:
             raise ImportError("pylsl not available.")
         
@@ -128,8 +273,18 @@ class DLMyoStreamer:
         self._running = False
         self._loop = None
         self._thread = None
+        self._stop_event = None
         self.emg_outlet = None
         self.imu_outlet = None
+        # Bound outlet.push_chunk methods, set with the outlets
+        self._push_emg = None
+        self._push_imu = None
+        # Each dl-myo EMG packet carries two 8-channel samples; reused per packet
+        self._emg_buf = np.empty((2, 8), dtype=np.float32)
+        # IMU samples are written in place into this ring, row
+        # imu_sample_count % _IMU_RING (see _EXTRACTORS for field access)
+        self._imu_ring = np.tile(_IMU_DEFAULT, (self._IMU_RING, 1))
+        self._imu_logged = False
         
     def _setup_lsl_outlets(self):
         """Create LSL outlets for EMG and IMU data."""
@@ -143,17 +298,10 @@ class DLMyoStreamer:
             source_id=f'{self.stream_name}_EMG'
         )
         
-        desc = emg_info.desc()
-        desc.append_child_value("manufacturer", "Thalmic Labs")
-        desc.append_child_value("backend", "dl-myo")
-        channels = desc.append_child("channels")
-        for i in range(8):
-            ch = channels.append_child("channel")
-            ch.append_child_value("label", f"EMG_{i+1}")
-            ch.append_child_value("unit", "raw")
-            ch.append_child_value("type", "EMG")
+        _describe_outlet(emg_info, "dl-myo", ((_EMG_LABELS, "raw", "EMG"),))
         
         self.emg_outlet = pylsl.StreamOutlet(emg_info)
+        self._push_emg = self.emg_outlet.push_chunk
         print(f"Created LSL outlet: {self.stream_name}_EMG ({self.sample_rate}Hz, 8ch)")
         
         # IMU outlet (10 channels: quat(4) + accel(3) + gyro(3))
@@ -167,33 +315,10 @@ class DLMyoStreamer:
                 source_id=f'{self.stream_name}_IMU'
             )
             
-            desc = imu_info.desc()
-            desc.append_child_value("manufacturer", "Thalmic Labs")
-            desc.append_child_value("backend", "dl-myo")
-            channels = desc.append_child("channels")
-            
-            # Quaternion (orientation)
-            for label in ["quat_w", "quat_x", "quat_y", "quat_z"]:
-                ch = channels.append_child("channel")
-                ch.append_child_value("label", label)
-                ch.append_child_value("unit", "normalized")
-                ch.append_child_value("type", "Orientation")
-            
-            # Accelerometer
-            for label in ["accel_x", "accel_y", "accel_z"]:
-                ch = channels.append_child("channel")
-                ch.append_child_value("label", label)
-                ch.append_child_value("unit", "g")
-                ch.append_child_value("type", "Accelerometer")
-            
-            # Gyroscope
-            for label in ["gyro_x", "gyro_y", "gyro_z"]:
-                ch = channels.append_child("channel")
-                ch.append_child_value("label", label)
-                ch.append_child_value("unit", "deg/s")
-                ch.append_child_value("type", "Gyroscope")
+            _describe_outlet(imu_info, "dl-myo", _IMU_CHANNELS)
             
             self.imu_outlet = pylsl.StreamOutlet(imu_info)
+            self._push_imu = self.imu_outlet.push_chunk
             print(f"Created LSL outlet: {self.stream_name}_IMU ({self.imu_sample_rate}Hz, 10ch)")
     
     def _create_client_class(self):
@@ -204,19 +329,32 @@ class DLMyoStreamer:
             async def on_emg_data(self, emg):
                 """Called when EMG data is received."""
                 try:
-                    # EMGData has sample1 and sample2 attributes
-                    for sample in [emg.sample1, emg.sample2]:
+                    # EMGData has sample1 and sample2 attributes; push the
+                    # present ones as one contiguous chunk
+                    buf = streamer._emg_buf
+                    n = 0
+                    for sample in (emg.sample1, emg.sample2):
                         if sample:
-                            streamer.emg_outlet.push_sample(list(sample))
-                            streamer.sample_count += 1
-                except Exception as e:
+                            buf[n] = sample
+                            n += 1
+                    if n:
+                        # Pushed inline: the push is a ~3 us buffer copy into
+                        # liblsl, cheaper than handing it to an executor
+                        streamer._push_emg(buf if n == 2 else buf[:n])
+                        streamer.sample_count += n
+                except AttributeError:
                     # Try alternate data format
                     try:
                         if hasattr(emg, '__iter__'):
-                            streamer.emg_outlet.push_sample(list(emg)[:8])
+                            # Read the first 8 values straight into the chunk buffer
+                            buf = streamer._emg_buf
+                            buf[0] = np.fromiter(emg, dtype=np.float32, count=8)
+                            streamer._push_emg(buf[:1])
                             streamer.sample_count += 1
-                    except:
-                        pass
+                    except Exception as e:
+                        logger.debug(f"Dropped EMG packet: {e}")
+                except Exception as e:
+                    logger.debug(f"Dropped EMG packet: {e}")
             
             async def on_imu_data(self, imu):
                 """Called when IMU data is received."""
@@ -226,71 +364,26 @@ class DLMyoStreamer:
                 try:
                     # IMU data typically has orientation, accelerometer, gyroscope
                     # Format: [quat_w, quat_x, quat_y, quat_z, accel_x, accel_y, accel_z, gyro_x, gyro_y, gyro_z]
-                    sample = []
-                    
-                    # Orientation (quaternion)
-                    if hasattr(imu, 'orientation'):
-                        ori = imu.orientation
-                        if hasattr(ori, 'w'):
-                            sample.extend([ori.w, ori.x, ori.y, ori.z])
-                        elif hasattr(ori, '__iter__'):
-                            sample.extend(list(ori)[:4])
-                        else:
-                            sample.extend([1.0, 0.0, 0.0, 0.0])  # Default quaternion
-                    elif hasattr(imu, 'quat'):
-                        q = imu.quat
-                        if hasattr(q, 'w'):
-                            sample.extend([q.w, q.x, q.y, q.z])
-                        else:
-                            sample.extend(list(q)[:4])
-                    else:
-                        sample.extend([1.0, 0.0, 0.0, 0.0])
-                    
-                    # Accelerometer
-                    if hasattr(imu, 'accelerometer'):
-                        acc = imu.accelerometer
-                        if hasattr(acc, 'x'):
-                            sample.extend([acc.x, acc.y, acc.z])
-                        elif hasattr(acc, '__iter__'):
-                            sample.extend(list(acc)[:3])
-                        else:
-                            sample.extend([0.0, 0.0, 0.0])
-                    elif hasattr(imu, 'accel'):
-                        acc = imu.accel
-                        if hasattr(acc, 'x'):
-                            sample.extend([acc.x, acc.y, acc.z])
-                        else:
-                            sample.extend(list(acc)[:3])
-                    else:
-                        sample.extend([0.0, 0.0, 0.0])
+                    extract = _EXTRACTORS.get(type(imu))
+                    if extract is None:
+                        extract = _EXTRACTORS[type(imu)] = _build_imu_extractor(imu)
+                    row = streamer._imu_ring[streamer.imu_sample_count % streamer._IMU_RING]
+                    extract(imu, row)
                     
-                    # Gyroscope
-                    if hasattr(imu, 'gyroscope'):
-                        gyro = imu.gyroscope
-                        if hasattr(gyro, 'x'):
-                            sample.extend([gyro.x, gyro.y, gyro.z])
-                        elif hasattr(gyro, '__iter__'):
-                            sample.extend(list(gyro)[:3])
-                        else:
-                            sample.extend([0.0, 0.0, 0.0])
-                    elif hasattr(imu, 'gyro'):
-                        gyro = imu.gyro
-                        if hasattr(gyro, 'x'):
-                            sample.extend([gyro.x, gyro.y, gyro.z])
-                        else:
-                            sample.extend(list(gyro)[:3])
-                    else:
-                        sample.extend([0.0, 0.0, 0.0])
-                    
-                    # Push the 10-channel sample
-                    if len(sample) == 10:
-                        streamer.imu_outlet.push_sample(sample)
-                        streamer.imu_sample_count += 1
+                    # Push the 10-channel sample. push_chunk hands the float32
+                    # row to liblsl without unpacking it, and ctypes releases
+                    # the GIL for the duration of that call.
+                    streamer._push_imu(row)
+                    streamer.imu_sample_count += 1
                 
                 except Exception as e:
-                    # Debug: print the IMU data structure
-                    if streamer.imu_sample_count == 0:
-                        print(f"IMU data format: {type(imu)}, attrs: {dir(imu)}")
+                    # Layout didn't match; re-inspect on the next sample
+                    _EXTRACTORS.pop(type(imu), None)
+                    # Debug: print the IMU data structure, once
+                    if not streamer._imu_logged:
+                        fields = getattr(type(imu), '__slots__', None) or list(getattr(imu, '__dict__', {}))
+                        print(f"IMU data format: {type(imu).__name__}, fields: {fields} ({e})")
+                        streamer._imu_logged = True
             
             # Required abstract method stubs
             async def on_classifier_event(self, ce):
@@ -318,6 +411,9 @@ class DLMyoStreamer:
         print("\nUsing native Bluetooth - no dongle needed!")
         print("IMPORTANT: Make sure MyoConnect is CLOSED!\n")
         
+        # Set from stop() via the loop, so idling needs no polling
+        self._stop_event = asyncio.Event()
+        
         # Setup LSL outlets
         self._setup_lsl_outlets()
         
@@ -374,10 +470,9 @@ class DLMyoStreamer:
         if self.enable_imu:
             print(f"Streaming IMU at {self.imu_sample_rate}Hz (orientation + accel + gyro)")
         
-        # Keep running
+        # Keep running until stop() sets the event
         self._running = True
-        while self._running:
-            await asyncio.sleep(0.1)
+        await self._stop_event.wait()
         
         # Cleanup
         try:
@@ -388,7 +483,11 @@ class DLMyoStreamer:
     
     def _run_in_thread(self):
         """Run the async loop in a separate thread."""
-        self._loop = asyncio.new_event_loop()
+        try:
+            import uvloop
+            self._loop = uvloop.new_event_loop()
+        except ImportError:
+            self._loop = asyncio.new_event_loop()
         asyncio.set_event_loop(self._loop)
         try:
             self._loop.run_until_complete(self._run_async())
@@ -407,6 +506,11 @@ class DLMyoStreamer:
     def stop(self):
         """Stop streaming."""
         self._running = False
+        if self._loop and self._stop_event:
+            try:
+                self._loop.call_soon_threadsafe(self._stop_event.set)
+            except RuntimeError:
+                pass  # Loop already closed
         if self._thread:
             self._thread.join(timeout=3.0)
         print(f"\nStreamed {self.sample_count} EMG samples")
@@ -414,6 +518,31 @@ class DLMyoStreamer:
             print(f"Streamed {self.imu_sample_count} IMU samples")
         print("Myo streamer stopped")
     
+    def get_recent(self, n: int) -> np.ndarray:
+        """
+        Return the most recent IMU samples.
+        
+        Parameters
+        ----------
+        n : int
+            Number of samples wanted. Fewer are returned if fewer have
+            arrived, and at most _IMU_RING are kept.
+        
+        Returns
+        -------
+        np.ndarray
+            Contiguous (n, 10) float32 copy, oldest sample first, with the IMU
+            outlet's columns: quat w/x/y/z, accel x/y/z, gyro x/y/z.
+        """
+        ring = self._imu_ring
+        size = len(ring)
+        head = self.imu_sample_count
+        n = max(0, min(n, head, size))
+        start = (head - n) % size
+        if start + n <= size:
+            return ring[start:start + n].copy()
+        return np.concatenate((ring[start:], ring[:start + n - size]))
+    
     @property
     def is_connected(self) -> bool:
         return self._running
@@ -431,6 +560,9 @@ class PyoMyoStreamer:
     Note: IMU not supported with pyomyo backend.
     """
     
+    # Maximum EMG samples sent per LSL push_chunk
+    _MAX_BATCH = 64
+    
     def __init__(self, stream_name: str = "Myo", mode: str = "raw", tty: str = None, **kwargs):
         # Note: enable_imu and other kwargs are ignored - pyomyo only supports EMG
         if not HAS_PYOMYO:
@@ -459,8 +591,19 @@ class PyoMyoStreamer:
         self.sample_count = 0
         self._running = False
         self._thread = None
+        self._drain_thread = None  # runs _lsl_thread
         self.emg_outlet = None
-        self._emg_queue = Queue()
+        self._push_emg = None  # bound emg_outlet.push_chunk
+        # Single producer (pyomyo thread) / single consumer (LSL thread):
+        # deque append/popleft are atomic, the Event only signals new data
+        self._emg_queue = deque(maxlen=4096)
+        self._emg_ready = threading.Event()
+        # Reused per LSL push; dtype matches the outlet's channel format
+        self._emg_batch = np.empty((self._MAX_BATCH, 8),
+                                   dtype=np.int8 if self.emg_mode == emg_mode.RAW else np.float32)
+        # LSL pushes run on one worker (keeps chunk order) so the drain thread
+        # never waits on liblsl
+        self._push_pool = None
     
     def _setup_lsl_outlet(self):
         """Create LSL outlet."""
@@ -473,30 +616,45 @@ class PyoMyoStreamer:
             source_id=f'{self.stream_name}_EMG'
         )
         
-        desc = emg_info.desc()
-        desc.append_child_value("manufacturer", "Thalmic Labs")
-        desc.append_child_value("backend", "pyomyo")
-        channels = desc.append_child("channels")
-        for i in range(8):
-            ch = channels.append_child("channel")
-            ch.append_child_value("label", f"EMG_{i+1}")
+        _describe_outlet(emg_info, "pyomyo", ((_EMG_LABELS, None, None),))
         
         self.emg_outlet = pylsl.StreamOutlet(emg_info)
+        self._push_emg = self.emg_outlet.push_chunk
         print(f"Created LSL outlet: {self.stream_name}_EMG ({self.sample_rate}Hz)")
     
     def _emg_callback(self, emg, movement):
         """Called when EMG data is received."""
-        self._emg_queue.put(list(emg))
+        # pyomyo hands us an immutable tuple; queue it as-is
+        self._emg_queue.append(emg)
+        self._emg_ready.set()
+    
+    def _push_chunk(self, chunk: np.ndarray, timestamp: float):
+        """Push one batch of EMG samples to LSL (runs on the push worker)."""
+        try:
+            # timestamp belongs to the last sample; liblsl derives the
+            # earlier ones from the nominal rate
+            self._push_emg(chunk, timestamp=timestamp)
+            self.sample_count += len(chunk)
+        except Exception:
+            pass
     
     def _lsl_thread(self):
-        """Push EMG data to LSL."""
+        """Drain queued EMG samples and hand them to the push worker in batches."""
+        batch = self._emg_batch
+        queue = self._emg_queue
         while self._running:
-            try:
-                emg = self._emg_queue.get(timeout=0.1)
-                self.emg_outlet.push_sample(emg)
-                self.sample_count += 1
-            except:
-                pass
+            if not self._emg_ready.wait(timeout=0.1):
+                continue
+            self._emg_ready.clear()
+            while queue:
+                n = 0
+                while queue and n < self._MAX_BATCH:
+                    batch[n] = queue.popleft()
+                    n += 1
+                # Copy: the staging batch is refilled while the worker pushes.
+                # Stamp here so time spent waiting for the worker isn't
+                # added to the samples' latency.
+                self._push_pool.submit(self._push_chunk, batch[:n].copy(), pylsl.local_clock())
     
     def _run_loop(self):
         """Main pyomyo run loop."""
@@ -534,7 +692,9 @@ class PyoMyoStreamer:
         self._running = True
         
         # Start threads
-        threading.Thread(target=self._lsl_thread, daemon=True).start()
+        self._push_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="myo-lsl")
+        self._drain_thread = threading.Thread(target=self._lsl_thread, daemon=True)
+        self._drain_thread.start()
         self._thread = threading.Thread(target=self._run_loop, daemon=True)
         self._thread.start()
         
@@ -546,6 +706,15 @@ class PyoMyoStreamer:
         self._running = False
         if self._thread:
             self._thread.join(timeout=2.0)
+        # The drain thread submits to the push pool, so it must be gone
+        # before the pool is shut down
+        if self._drain_thread:
+            self._emg_ready.set()  # wake it to see _running is False
+            self._drain_thread.join(timeout=2.0)
+            self._drain_thread = None
+        if self._push_pool:
+            self._push_pool.shutdown(wait=True)
+            self._push_pool = None
         if self.myo:
             try:
                 self.myo.disconnect()
@@ -563,6 +732,46 @@ class PyoMyoStreamer:
 # Mock Streamer (for testing)
 # ============================================================================
 
+_MOCK_CH_PHASE = np.arange(8) * np.pi / 4
+# Noise std of the mock accelerometer (g) and gyroscope (deg/s) columns
+_MOCK_IMU_NOISE = np.array([0.1, 0.1, 0.1, 5.0, 5.0, 5.0])
+
+
+def _mock_emg_block(rng: np.random.Generator, t: np.ndarray, out: np.ndarray):
+    """
+    Fill out (len(t) x 8) with synthetic EMG for sample times t.
+    
+    Baseline noise, bursts on channels whose 0.3 Hz activation wave is high,
+    plus 60 Hz line interference - all samples and channels at once.
+    """
+    n = len(t)
+    noise = rng.normal(0, 5, (n, 8))
+    active = np.sin(2 * np.pi * 0.3 * t[:, np.newaxis] + _MOCK_CH_PHASE) > 0.6
+    noise[active] += rng.normal(50, 20, np.count_nonzero(active))
+    noise += 3 * np.sin(2 * np.pi * 60 * t)[:, np.newaxis]
+    out[:] = noise
+
+
+def _mock_imu_block(rng: np.random.Generator, t: np.ndarray, out: np.ndarray):
+    """
+    Fill out (len(t) x 10) with synthetic IMU samples for sample times t.
+    
+    Slow rotation about the Y axis, gravity plus noise on the accelerometer,
+    and noisy angular velocity with a 0.2 Hz swing on gyro Y.
+    """
+    # Simulate slow rotation around the Y axis (unit quaternion, half-angle)
+    half = (t * 0.25) % np.pi
+    out[:, 0] = np.cos(half)
+    out[:, 1] = 0.0
+    out[:, 2] = np.sin(half)
+    out[:, 3] = 0.0
+    
+    # Accelerometer + gyroscope noise in one draw, scaled per column
+    out[:, 4:10] = rng.standard_normal((len(t), 6)) * _MOCK_IMU_NOISE
+    out[:, 6] -= 1.0  # gravity pointing down
+    out[:, 8] += 30 * np.sin(2 * np.pi * 0.2 * t)  # simulated movement
+
+
 class MockMyoStreamer:
     """Mock Myo streamer for testing without hardware."""
     
@@ -578,9 +787,9 @@ class MockMyoStreamer:
         self.imu_sample_count = 0
         self._running = False
         self._thread = None
-        self._imu_thread = None
         self.emg_outlet = None
         self.imu_outlet = None
+        self._rng = np.random.default_rng()
     
     def _setup_lsl_outlets(self):
         """Create LSL outlets."""
@@ -618,75 +827,55 @@ class MockMyoStreamer:
         
         self._setup_lsl_outlets()
         self._running = True
-        self._thread = threading.Thread(target=self._generate_emg_data, daemon=True)
+        self._thread = threading.Thread(target=self._generate_data, daemon=True)
         self._thread.start()
         
-        if self.enable_imu:
-            self._imu_thread = threading.Thread(target=self._generate_imu_data, daemon=True)
-            self._imu_thread.start()
-        
         print("Mock streamer started")
     
-    def _generate_emg_data(self):
-        """Generate synthetic EMG data."""
-        t = 0
-        dt = 1.0 / self.sample_rate
-        while self._running:
-            emg = []
-            for ch in range(8):
-                val = np.random.normal(0, 5)
-                if np.sin(2 * np.pi * 0.3 * t + ch * np.pi / 4) > 0.6:
-                    val += np.random.normal(50, 20)
-                val += 3 * np.sin(2 * np.pi * 60 * t)
-                emg.append(val)
-            
-            self.emg_outlet.push_sample(emg)
-            self.sample_count += 1
-            t += dt
-            time.sleep(dt)
-    
-    def _generate_imu_data(self):
-        """Generate synthetic IMU data."""
-        t = 0
-        dt = 1.0 / self.imu_sample_rate
+    def _generate_data(self):
+        """
+        Generate both mock streams on one thread, one push_chunk per block.
         
-        # Initial orientation (unit quaternion)
-        angle = 0
+        Sample n of a stream is due at start + n*dt. Each pass sleeps until
+        the earliest pending block's last sample is due and sends that block,
+        so both streams hold their nominal rates without drift.
+        """
+        block_size = 10
+        offsets = np.arange(block_size)
+        rng = self._rng
+        emg_dt = 1.0 / self.sample_rate
+        imu_dt = 1.0 / self.imu_sample_rate
+        emg_block = np.empty((block_size, 8), dtype=np.float32)
+        imu_block = np.empty((block_size, 10), dtype=np.float32)
+        
+        start = time.perf_counter()
+        lsl_start = pylsl.local_clock()
+        n_emg = n_imu = 0
         
         while self._running:
-            # Simulate slow rotation (quaternion)
-            angle = (t * 0.5) % (2 * np.pi)  # Slow rotation
-            quat_w = np.cos(angle / 2)
-            quat_x = 0
-            quat_y = np.sin(angle / 2)  # Rotation around Y axis
-            quat_z = 0
-            
-            # Accelerometer (gravity + small movements)
-            accel_x = np.random.normal(0, 0.1)
-            accel_y = np.random.normal(0, 0.1)
-            accel_z = np.random.normal(-1.0, 0.1)  # Gravity pointing down
+            emg_due = (n_emg + block_size - 1) * emg_dt
+            imu_due = (n_imu + block_size - 1) * imu_dt if self.enable_imu else float('inf')
+            due = min(emg_due, imu_due)
+            slack = start + due - time.perf_counter()
+            if slack > 0:
+                time.sleep(slack)
             
-            # Gyroscope (small angular velocities)
-            gyro_x = np.random.normal(0, 5)
-            gyro_y = np.random.normal(0, 5) + 30 * np.sin(2 * np.pi * 0.2 * t)  # Simulate movement
-            gyro_z = np.random.normal(0, 5)
-            
-            imu_sample = [quat_w, quat_x, quat_y, quat_z, 
-                         accel_x, accel_y, accel_z,
-                         gyro_x, gyro_y, gyro_z]
-            
-            self.imu_outlet.push_sample(imu_sample)
-            self.imu_sample_count += 1
-            t += dt
-            time.sleep(dt)
+            if emg_due <= imu_due:
+                _mock_emg_block(rng, (n_emg + offsets) * emg_dt, emg_block)
+                self.emg_outlet.push_chunk(emg_block, timestamp=lsl_start + emg_due)
+                self.sample_count += block_size
+                n_emg += block_size
+            else:
+                _mock_imu_block(rng, (n_imu + offsets) * imu_dt, imu_block)
+                self.imu_outlet.push_chunk(imu_block, timestamp=lsl_start + imu_due)
+                self.imu_sample_count += block_size
+                n_imu += block_size
     
     def stop(self):
         """Stop generating data."""
         self._running = False
         if self._thread:
             self._thread.join(timeout=1.0)
-        if self._imu_thread:
-            self._imu_thread.join(timeout=1.0)
         print(f"\nMock streamer stopped.")
         print(f"  Generated {self.sample_count} EMG samples")
         if self.enable_imu:
@@ -751,8 +940,14 @@ def create_streamer(backend: str = "auto", **kwargs):
 # Scanning for Devices
 # ============================================================================
 
-async def scan_for_myos(timeout: float = 5.0) -> list:
-    """Scan for Myo devices using Bluetooth."""
+async def scan_for_myos(timeout: float = 5.0, expected_count: Optional[int] = None) -> list:
+    """
+    Scan for Myo devices using Bluetooth.
+    
+    Advertisements are filtered as they arrive, so only Myos are kept. The
+    scan stops after timeout seconds, or as soon as expected_count Myos have
+    been seen.
+    """
     if not HAS_BLEAK:
         print("bleak required for scanning. Install with: pip install bleak")
         print("(Or install dl-myo which includes bleak: pip install dl-myo)")
@@ -761,20 +956,28 @@ async def scan_for_myos(timeout: float = 5.0) -> list:
     print(f"\nScanning for Myo devices ({timeout}s)...")
     print("-" * 40)
     
-    devices = await bleak.BleakScanner.discover(timeout=timeout)
+    found = {}
+    async with aclosing(iter_myos(timeout)) as advertisements:
+        async for device, adv in advertisements:
+            if device.address in found:
+                found[device.address]["rssi"] = adv.rssi
+                continue
+            name = adv.local_name or device.name or "Myo"
+            found[device.address] = {"name": name, "mac": device.address, "rssi": adv.rssi}
+            if expected_count is not None and len(found) >= expected_count:
+                break
     
-    myos = []
-    for d in devices:
-        # Myo has a specific service UUID or name containing "Myo"
-        name = d.name or ""
-        if "Myo" in name:
-            myos.append({"name": name, "mac": d.address, "rssi": d.rssi})
-            rssi_str = f"{d.rssi} dBm" if d.rssi else "N/A"
-            print(f"  [{len(myos)}] {name}")
-            print(f"      MAC: {d.address}")
-            print(f"      Signal: {rssi_str}")
+    myos = list(found.values())
     
-    print("-" * 40)
+    # Build the device list and the footer rule as one block, one write
+    lines = []
+    for i, m in enumerate(myos, 1):
+        rssi_str = f"{m['rssi']} dBm" if m['rssi'] else "N/A"
+        lines.append(f"  [{i}] {m['name']}\n"
+                     f"      MAC: {m['mac']}\n"
+                     f"      Signal: {rssi_str}")
+    lines.append("-" * 40)
+    print("\n".join(lines), flush=True)
     
     if not myos:
         print("No Myo devices found.")
@@ -789,61 +992,169 @@ async def scan_for_myos(timeout: float = 5.0) -> list:
     return myos
 
 
+# Vibrate command (VibrationType.SHORT) for the MYO_COMMAND_UUID characteristic
+_VIBRATE_SHORT_CMD = bytes([0x03, 0x01, 0x01])
+
+# A disconnect gets at least this long even when the ping's deadline is
+# nearly spent, so a slow connect doesn't leave a half-closed link behind
+_DISCONNECT_TIMEOUT = 2.0
+
+
+async def _disconnect(client, mac: str, timeout: float):
+    """
+    Disconnect a ping client, waiting (up to timeout) for it to finish.
+    
+    A disconnect that never completes can leave BlueZ holding the link and
+    stall the next connect to that device, so a timeout is reported rather
+    than ignored. Errors from a link that is already gone are expected.
+    """
+    try:
+        await asyncio.wait_for(client.disconnect(), timeout=timeout)
+    except asyncio.TimeoutError:
+        print(f"  Warning: disconnect from {mac} timed out; "
+              f"the Bluetooth adapter may need a reset")
+        return
+    except Exception as e:
+        if BleakError is None or not isinstance(e, BleakError):
+            print(f"  Warning: disconnect from {mac} failed: {e}")
+        return
+    
+    if sys.platform.startswith("linux"):
+        # Give BlueZ a moment to drop the device's cached GATT objects
+        await asyncio.sleep(0.2)
+
+
+async def _ping_bleak(mac: str, remaining: Callable[[], float]) -> Optional[str]:
+    """
+    Vibrate a Myo twice with a bare BleakClient; returns an error or None.
+    
+    Writes the vibrate command straight to the command characteristic, so
+    none of the EMG/IMU notifications a full Myo client sets up are needed.
+    Every step is bounded by remaining(), the time left until the ping's
+    deadline, except the disconnect, which always gets _DISCONNECT_TIMEOUT.
+    """
+    client = _get_bleak().BleakClient(mac, timeout=remaining())
+    await client.connect()
+    try:
+        char = client.services.get_characteristic(MYO_COMMAND_UUID)
+        if char is None:
+            return f"{mac} has no Myo command characteristic"
+        response = "write-without-response" not in char.properties
+        await asyncio.wait_for(client.write_gatt_char(char, _VIBRATE_SHORT_CMD, response=response),
+                               timeout=remaining())
+        await asyncio.sleep(0.3)
+        await asyncio.wait_for(client.write_gatt_char(char, _VIBRATE_SHORT_CMD, response=response),
+                               timeout=remaining())
+    finally:
+        await _disconnect(client, mac, max(remaining(), _DISCONNECT_TIMEOUT))
+    return None
+
+
+async def _ping_dlmyo(mac: str, remaining: Callable[[], float]) -> Optional[str]:
+    """Vibrate a Myo twice through a minimal dl-myo client; returns an error or None."""
+    # Create a minimal client just to connect and vibrate
+    class PingClient(_load_dlmyo()):
+        async def on_emg_data(self, emg): pass
+        async def on_classifier_event(self, ce): pass
+        async def on_aggregated_data(self, ad): pass
+        async def on_emg_data_aggregated(self, emg): pass
+        async def on_fv_data(self, fvd): pass
+        async def on_imu_data(self, imu): pass
+        async def on_motion_event(self, me): pass
+    
+    client = await asyncio.wait_for(
+        PingClient.with_device(mac=mac),
+        timeout=remaining()
+    )
+    
+    if client is None:
+        return f"Could not connect to {mac}"
+    
+    # Vibrate to identify
+    try:
+        from myo.types import VibrationType
+        await asyncio.wait_for(client.vibrate(VibrationType.SHORT), timeout=remaining())
+        await asyncio.sleep(0.3)
+        await asyncio.wait_for(client.vibrate(VibrationType.SHORT), timeout=remaining())
+    except Exception as e:
+        print(f"  Warning: Could not vibrate {mac}: {e}")
+    
+    await _disconnect(client, mac, max(remaining(), _DISCONNECT_TIMEOUT))
+    return None
+
+
+async def _ping_one(mac: str, timeout: float = 5.0) -> Tuple[str, bool, Optional[str]]:
+    """
+    Connect to one Myo, vibrate it twice and disconnect.
+    
+    Uses plain bleak when available, dl-myo otherwise. The whole exchange
+    shares one deadline, timeout seconds from the start, so a device that
+    connects and then stalls can't hang the ping. Returns (mac, success,
+    error message or None) instead of printing, so several pings can run
+    concurrently and be reported together.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    
+    def remaining() -> float:
+        # Floor so a late step still gets a brief chance instead of failing outright
+        return max(0.1, deadline - loop.time())
+    
+    try:
+        if HAS_BLEAK:
+            err = await _ping_bleak(mac, remaining)
+        else:
+            err = await _ping_dlmyo(mac, remaining)
+        return mac, err is None, err
+    except asyncio.TimeoutError:
+        return mac, False, f"Timeout pinging {mac}"
+    except Exception as e:
+        return mac, False, f"Error: {e}"
+
+
 async def ping_myo(mac: str, timeout: float = 5.0) -> bool:
     """
     Ping a Myo device to verify it's reachable and identify it.
     The Myo will vibrate when pinged successfully.
     """
-    if not HAS_DLMYO:
-        print("dl-myo required for pinging. Install with: pip install dl-myo")
+    if not HAS_BLEAK and not HAS_DLMYO:
+        print("bleak required for pinging. Install with: pip install bleak")
         return False
     
     print(f"\nPinging Myo at {mac}...")
-    
-    try:
-        # Create a minimal client just to connect and vibrate
-        class PingClient(DLMyoClient):
-            async def on_emg_data(self, emg): pass
-            async def on_classifier_event(self, ce): pass
-            async def on_aggregated_data(self, ad): pass
-            async def on_emg_data_aggregated(self, emg): pass
-            async def on_fv_data(self, fvd): pass
-            async def on_imu_data(self, imu): pass
-            async def on_motion_event(self, me): pass
-        
-        client = await asyncio.wait_for(
-            PingClient.with_device(mac=mac),
-            timeout=timeout
-        )
-        
-        if client is None:
-            print(f"  ✗ Could not connect to {mac}")
-            return False
-        
-        # Vibrate to identify
-        try:
-            from myo.types import VibrationType
-            await client.vibrate(VibrationType.SHORT)
-            await asyncio.sleep(0.3)
-            await client.vibrate(VibrationType.SHORT)
-        except Exception as e:
-            print(f"  Warning: Could not vibrate: {e}")
-        
-        # Disconnect
-        try:
-            await client.disconnect()
-        except:
-            pass
-        
+    _, ok, err = await _ping_one(mac, timeout)
+    if ok:
         print(f"  ✓ Myo at {mac} responded! (It should have vibrated twice)")
-        return True
-        
-    except asyncio.TimeoutError:
-        print(f"  ✗ Timeout connecting to {mac}")
-        return False
-    except Exception as e:
-        print(f"  ✗ Error: {e}")
-        return False
+    else:
+        print(f"  ✗ {err}")
+    return ok
+
+
+async def ping_all_myos(macs: List[str], timeout: float = 5.0, max_concurrent: int = 4) -> Dict[str, bool]:
+    """
+    Ping several Myos concurrently and print a summary.
+    
+    At most max_concurrent connections are open at once, since BlueZ and
+    most adapters handle only a few simultaneous connection attempts.
+    Returns {mac: success}.
+    """
+    if not HAS_BLEAK and not HAS_DLMYO:
+        print("bleak required for pinging. Install with: pip install bleak")
+        return {}
+    
+    print(f"\nPinging {len(macs)} Myo(s)...")
+    limit = asyncio.Semaphore(max_concurrent)
+    
+    async def ping(mac):
+        async with limit:
+            return await _ping_one(mac, timeout)
+    
+    results = await asyncio.gather(*(ping(mac) for mac in macs))
+    
+    for i, (mac, ok, err) in enumerate(results, 1):
+        status = "✓ vibrated" if ok else f"✗ {err}"
+        print(f"  [{i}] {mac}  {status}")
+    return {mac: ok for mac, ok, _ in results}
 
 
 async def interactive_select() -> str:
@@ -865,10 +1176,10 @@ async def interactive_select() -> str:
     if len(myos) == 1:
         mac = myos[0]['mac']
         print(f"\nOnly one Myo found: {mac}")
-        response = input("Use this device? [Y/n]: ").strip().lower()
+        response = (await ainput("Use this device? [Y/n]: ")).strip().lower()
         if response in ['', 'y', 'yes']:
             # Offer to ping
-            ping = input("Ping to verify? (Myo will vibrate) [Y/n]: ").strip().lower()
+            ping = (await ainput("Ping to verify? (Myo will vibrate) [Y/n]: ")).strip().lower()
             if ping in ['', 'y', 'yes']:
                 await ping_myo(mac)
             return mac
@@ -879,10 +1190,11 @@ async def interactive_select() -> str:
         print("\nOptions:")
         print("  [1-{}] Select a Myo by number".format(len(myos)))
         print("  [p #]  Ping a Myo (e.g., 'p 1' to ping device 1)")
+        print("  [p *]  Ping all Myos at once")
         print("  [r]    Rescan for devices")
         print("  [q]    Quit")
         
-        choice = input("\nYour choice: ").strip().lower()
+        choice = (await ainput("\nYour choice: ")).strip().lower()
         
         if choice == 'q':
             return None
@@ -893,6 +1205,10 @@ async def interactive_select() -> str:
                 return None
             continue
         
+        if choice == 'p *':
+            await ping_all_myos([m['mac'] for m in myos])
+            continue
+        
         if choice.startswith('p '):
             try:
                 idx = int(choice[2:]) - 1
@@ -912,11 +1228,11 @@ async def interactive_select() -> str:
                 print(f"\nSelected: {myos[idx]['name']} ({mac})")
                 
                 # Offer to ping
-                ping = input("Ping to verify? (Myo will vibrate) [Y/n]: ").strip().lower()
+                ping = (await ainput("Ping to verify? (Myo will vibrate) [Y/n]: ")).strip().lower()
                 if ping in ['', 'y', 'yes']:
                     success = await ping_myo(mac)
                     if not success:
-                        retry = input("Ping failed. Use anyway? [y/N]: ").strip().lower()
+                        retry = (await ainput("Ping failed. Use anyway? [y/N]: ")).strip().lower()
                         if retry not in ['y', 'yes']:
                             continue
                 
@@ -953,8 +1269,38 @@ def list_serial_ports():
 # Command Line Interface
 # ============================================================================
 
-def main():
-    """Main entry point."""
+def _status_loop(streamer, duration: int, enable_imu: bool):
+    """
+    Print sample counts once a second for duration seconds (0 = forever).
+    
+    Ticks are scheduled from a fixed monotonic start rather than sleeping a
+    second after each print, so a long run doesn't drift.
+    """
+    # Which counters exist can't change while streaming; pick the format once
+    prefix = "  {tick}/" + str(duration) + "s - " if duration > 0 else "  "
+    if enable_imu and hasattr(streamer, 'imu_sample_count'):
+        template = prefix + "EMG: {emg} | IMU: {imu}    "
+        def format_status(tick):
+            return template.format(tick=tick, emg=streamer.sample_count,
+                                   imu=streamer.imu_sample_count)
+    else:
+        template = prefix + "EMG: {emg}    "
+        def format_status(tick):
+            return template.format(tick=tick, emg=streamer.sample_count)
+    
+    start = time.monotonic()
+    tick = 0
+    while duration <= 0 or tick < duration:
+        tick += 1
+        delay = start + tick - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        print(format_status(tick), end='\r')
+    print()
+
+
+def _build_parser():
+    """Build the command-line parser."""
     import argparse
     
     parser = argparse.ArgumentParser(
@@ -1031,7 +1377,52 @@ IMPORTANT: Close MyoConnect before running!
     parser.add_argument("--duration", type=int, default=0,
                        help="Duration in seconds (0 = run until Ctrl+C)")
     
-    args = parser.parse_args()
+    return parser
+
+
+def _check_deps(args) -> Optional[str]:
+    """
+    Check up front that the chosen command's dependencies are installed.
+    
+    Follows the same dispatch order as main(), so e.g. --select fails
+    before its scan rather than after the user has picked a device.
+    Returns a message listing what is missing, or None.
+    """
+    missing = []
+    if args.scan or args.ping:
+        if not HAS_BLEAK:
+            missing.append("bleak:   pip install bleak")
+    elif args.list_ports:
+        pass  # list_serial_ports() reports a missing pyserial itself
+    else:
+        if args.select and not HAS_BLEAK:
+            missing.append("bleak:   pip install bleak")
+        if not HAS_LSL:
+            missing.append("pylsl:   pip install pylsl")
+        if args.mock:
+            pass
+        elif args.backend == "pyomyo" or (args.tty and not (args.select or args.mac)):
+            if not HAS_PYOMYO:
+                missing.append("pyomyo:  pip install git+https://github.com/PerlinWarp/pyomyo.git")
+        elif args.select or args.mac or args.backend == "dl-myo":
+            if not HAS_DLMYO:
+                missing.append("dl-myo:  pip install dl-myo")
+        elif not HAS_DLMYO and not HAS_PYOMYO:
+            missing.append("dl-myo:  pip install dl-myo  (or pyomyo for the dongle)")
+    
+    if not missing:
+        return None
+    return "Missing dependencies for this command:\n" + "\n".join(f"  {m}" for m in missing)
+
+
+def main():
+    """Main entry point."""
+    args = _build_parser().parse_args()
+    
+    err = _check_deps(args)
+    if err:
+        print(err)
+        return 2
     
     # Handle scan command
     if args.scan:
@@ -1081,21 +1472,9 @@ IMPORTANT: Close MyoConnect before running!
         
         if args.duration > 0:
             print(f"\nStreaming for {args.duration} seconds...")
-            for i in range(args.duration):
-                time.sleep(1)
-                status = f"  {i+1}/{args.duration}s - EMG: {streamer.sample_count}"
-                if enable_imu and hasattr(streamer, 'imu_sample_count'):
-                    status += f" | IMU: {streamer.imu_sample_count}"
-                print(status, end='\r')
-            print()
         else:
             print("\nStreaming... Press Ctrl+C to stop\n")
-            while True:
-                time.sleep(1)
-                status = f"  EMG: {streamer.sample_count}"
-                if enable_imu and hasattr(streamer, 'imu_sample_count'):
-                    status += f" | IMU: {streamer.imu_sample_count}"
-                print(status + "    ", end='\r')
+        _status_loop(streamer, args.duration, enable_imu)
     
     except KeyboardInterrupt:
         print("\n\nStopping...")
@@ -18,18 +18,24 @@ Author: BioRobotics Course
 import asyncio
 import argparse
 import sys
+from contextlib import aclosing
 
 try:
-    from bleak import BleakClient, BleakScanner
+    from bleak import BleakClient
 except ImportError:
     print("Error: bleak not installed")
     print("Install with: pip install bleak")
     sys.exit(1)
 
+try:
+    from .myo_scan import MYO_SERVICE_UUID, MYO_COMMAND_UUID, iter_myos
+except ImportError:
+    from myo_scan import MYO_SERVICE_UUID, MYO_COMMAND_UUID, iter_myos
+
 
-# Myo BLE UUIDs - prefix for matching
-MYO_SERVICE_PREFIX = "d5060001"  # Myo Control Service
-MYO_COMMAND_PREFIX = "d5060401"  # Command Characteristic
+# Myo BLE UUIDs, defined once in myo_scan.py
+MYO_CONTROL_SERVICE = MYO_SERVICE_UUID  # Myo Control Service
+MYO_COMMAND_CHAR = MYO_COMMAND_UUID     # Command Characteristic
 
 # Myo Commands (from myohw.h)
 CMD_VIBRATE = 0x03      # Vibrate command
@@ -40,17 +46,14 @@ VIBRATE_SHORT = 0x01
 VIBRATE_MEDIUM = 0x02
 VIBRATE_LONG = 0x03
 
-
 async def find_myo(timeout: float = 10.0) -> str:
-    """Scan for Myo armband and return its address."""
+    """Scan for Myo armband and return its address (stops at the first one)."""
     print(f"Scanning for Myo armband ({timeout}s timeout)...")
     
-    devices = await BleakScanner.discover(timeout=timeout)
-    
-    for device in devices:
-        name = device.name or ""
-        if "Myo" in name:
-            print(f"Found: {device.name} [{device.address}]")
+    async with aclosing(iter_myos(timeout)) as myos:
+        async for device, adv in myos:
+            name = adv.local_name or device.name or "Myo"
+            print(f"Found: {name} [{device.address}]")
             return device.address
     
     return None
@@ -68,25 +71,13 @@ async def power_off_myo(address: str) -> bool:
             
             print("Connected!")
             
-            # Find the command characteristic
-            print("\nDiscovering services...")
+            # Find the command characteristic (bleak indexes services by UUID)
             command_char = None
-            
-            for service in client.services:
-                service_uuid = str(service.uuid).lower()
-                
-                if MYO_SERVICE_PREFIX in service_uuid:
-                    print(f"\n  [Myo Control Service] {service.uuid}")
-                    
-                    for char in service.characteristics:
-                        char_uuid = str(char.uuid).lower()
-                        props = list(char.properties)
-                        print(f"    Char: {char.uuid}")
-                        print(f"          handle={char.handle}, props={props}")
-                        
-                        if MYO_COMMAND_PREFIX in char_uuid:
-                            command_char = char
-                            print(f"          ^ This is the COMMAND characteristic")
+            print("\nLooking up Myo control service...")
+            service = client.services.get_service(MYO_CONTROL_SERVICE)
+            if service is not None:
+                print(f"  [Myo Control Service] {service.uuid}")
+                command_char = service.get_characteristic(MYO_COMMAND_CHAR)
             
             if not command_char:
                 print("\n✗ Could not find Myo command characteristic")
@@ -101,45 +92,71 @@ async def power_off_myo(address: str) -> bool:
             use_response = "write" in command_char.properties
             print(f"  Write with response: {use_response}")
             
-            # Try vibrate first
-            print(f"\n--- Sending VIBRATE command ---")
             vibrate_cmd = bytes([CMD_VIBRATE, 0x01, VIBRATE_MEDIUM])
-            print(f"  Bytes: {vibrate_cmd.hex()} = {list(vibrate_cmd)}")
-            
-            try:
-                await client.write_gatt_char(command_char, vibrate_cmd, response=use_response)
-                print("  ✓ Vibrate sent (with response={})".format(use_response))
-            except Exception as e:
-                print(f"  ✗ Failed with response={use_response}: {e}")
-                # Try opposite
-                try:
-                    await client.write_gatt_char(command_char, vibrate_cmd, response=not use_response)
-                    print("  ✓ Vibrate sent (with response={})".format(not use_response))
-                    use_response = not use_response  # Update for deep sleep
-                except Exception as e2:
-                    print(f"  ✗ Also failed with response={not use_response}: {e2}")
-            
-            await asyncio.sleep(1.0)
-            
-            # Send deep sleep
-            print(f"\n--- Sending DEEP SLEEP command ---")
             deep_sleep_cmd = bytes([CMD_DEEP_SLEEP, 0x00])
-            print(f"  Bytes: {deep_sleep_cmd.hex()} = {list(deep_sleep_cmd)}")
             
-            try:
-                await client.write_gatt_char(command_char, deep_sleep_cmd, response=use_response)
-                print("  ✓ Deep sleep sent (with response={})".format(use_response))
-            except Exception as e:
-                print(f"  ✗ Failed: {e}")
-                # Try opposite
+            # Neither write needs an ACK (the vibrate is only a visual cue and
+            # the radio is going down anyway), so if the characteristic takes
+            # write-without-response, send both back to back
+            sent = False
+            if "write-without-response" in command_char.properties:
+                print(f"\n--- Sending VIBRATE + DEEP SLEEP (without response) ---")
+                print(f"  Bytes: {vibrate_cmd.hex()}, {deep_sleep_cmd.hex()}")
                 try:
-                    await client.write_gatt_char(command_char, deep_sleep_cmd, response=not use_response)
-                    print("  ✓ Deep sleep sent (with response={})".format(not use_response))
-                except Exception as e2:
-                    print(f"  ✗ Also failed: {e2}")
-                    return False
+                    await client.write_gatt_char(command_char, vibrate_cmd, response=False)
+                    await client.write_gatt_char(command_char, deep_sleep_cmd, response=False)
+                    # About one connection interval, so both leave before disconnect
+                    await asyncio.sleep(0.15)
+                    print("  ✓ Vibrate + deep sleep sent")
+                    sent = True
+                except Exception as e:
+                    print(f"  ✗ Failed: {e}; retrying one at a time")
             
-            await asyncio.sleep(0.5)
+            if not sent:
+                # Try vibrate first
+                print(f"\n--- Sending VIBRATE command ---")
+                print(f"  Bytes: {vibrate_cmd.hex()} = {list(vibrate_cmd)}")
+                
+                try:
+                    await client.write_gatt_char(command_char, vibrate_cmd, response=use_response)
+                    print("  ✓ Vibrate sent (with response={})".format(use_response))
+                except Exception as e:
+                    print(f"  ✗ Failed with response={use_response}: {e}")
+                    # Try opposite
+                    try:
+                        await client.write_gatt_char(command_char, vibrate_cmd, response=not use_response)
+                        print("  ✓ Vibrate sent (with response={})".format(not use_response))
+                        use_response = not use_response  # Update for deep sleep
+                    except Exception as e2:
+                        print(f"  ✗ Also failed with response={not use_response}: {e2}")
+                
+                # The firmware queues commands, so there's no need to wait out
+                # the motor; an acked write has already been received
+                await asyncio.sleep(0.05 if use_response else 0.15)
+                
+                # Send deep sleep
+                print(f"\n--- Sending DEEP SLEEP command ---")
+                print(f"  Bytes: {deep_sleep_cmd.hex()} = {list(deep_sleep_cmd)}")
+                
+                acked = use_response
+                try:
+                    await client.write_gatt_char(command_char, deep_sleep_cmd, response=use_response)
+                    print("  ✓ Deep sleep sent (with response={})".format(use_response))
+                except Exception as e:
+                    print(f"  ✗ Failed: {e}")
+                    # Try opposite
+                    try:
+                        await client.write_gatt_char(command_char, deep_sleep_cmd, response=not use_response)
+                        print("  ✓ Deep sleep sent (with response={})".format(not use_response))
+                        acked = not use_response
+                    except Exception as e2:
+                        print(f"  ✗ Also failed: {e2}")
+                        return False
+                
+                # An acked write has arrived; an unacked one gets about one
+                # connection interval to leave before the disconnect
+                if not acked:
+                    await asyncio.sleep(0.15)
             
             print("\n" + "="*50)
             print("Commands sent! If Myo didn't respond:")
@@ -0,0 +1,116 @@
+"""
+Myo Bluetooth Scanning
+======================
+
+Shared BLE scan for myo_interface.py and myo_power_off.py.
+
+iter_myos() yields Myo advertisements as they arrive, so a caller can stop
+as soon as it has what it needs instead of waiting out the whole scan
+window:
+
+    async with aclosing(iter_myos(timeout=10.0)) as myos:
+        async for device, adv in myos:
+            print(device.address)
+            break
+
+Requirements:
+    pip install bleak
+
+Author: BioRobotics Course
+"""
+
+import asyncio
+from typing import AsyncIterator, Callable, Optional, Tuple
+
+
+# Myo BLE UUIDs (lowercase, as bleak reports them)
+# Myo Control Service - advertised by every Myo
+MYO_SERVICE_UUID = "d5060001-a904-deb9-4748-2c7f4a124842"
+# Command characteristic (vibrate, sleep, mode changes) in that service
+MYO_COMMAND_UUID = "d5060401-a904-deb9-4748-2c7f4a124842"
+
+# One scanner per event loop, started/stopped around each scan window (e.g.
+# every rescan in interactive_select) instead of rebuilt. Advertisements go
+# to whichever scan is currently collecting them.
+_SCANNER = None
+_SCANNER_LOOP = None
+_scan_sink: Optional[Callable] = None
+
+
+def _dispatch_advertisement(device, adv):
+    if _scan_sink is not None:
+        _scan_sink(device, adv)
+
+
+def _get_scanner():
+    """Return the shared Myo scanner, creating it for the running loop."""
+    global _SCANNER, _SCANNER_LOOP
+    loop = asyncio.get_running_loop()
+    if _SCANNER is None or _SCANNER_LOOP is not loop:
+        import bleak  # deferred: loads the platform Bluetooth stack
+
+        # service_uuids lets the OS Bluetooth stack drop everything that
+        # isn't a Myo before it reaches Python
+        _SCANNER = bleak.BleakScanner(detection_callback=_dispatch_advertisement,
+                                      service_uuids=[MYO_SERVICE_UUID])
+        _SCANNER_LOOP = loop
+    return _SCANNER
+
+
+def is_myo(device, adv) -> bool:
+    """
+    True if an advertisement comes from a Myo.
+
+    Myo advertises its control service UUID and a name containing "Myo";
+    checked in Python too in case the backend ignores the scan filter.
+    """
+    name = adv.local_name or device.name or ""
+    return "Myo" in name or MYO_SERVICE_UUID in (adv.service_uuids or ())
+
+
+async def iter_myos(timeout: float = 5.0) -> AsyncIterator[Tuple[object, object]]:
+    """
+    Scan for Myos, yielding (device, advertisement_data) as they arrive.
+
+    Parameters
+    ----------
+    timeout : float
+        Scan window in seconds; iteration ends when it runs out.
+
+    Yields
+    ------
+    tuple
+        (BLEDevice, AdvertisementData) for every Myo advertisement, so the
+        same device can appear more than once (e.g. with updated RSSI).
+
+    Notes
+    -----
+    The scanner stops when the generator finishes or is closed. When
+    breaking out early, iterate under contextlib.aclosing() so that
+    happens right away rather than when the generator is collected.
+    """
+    global _scan_sink
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    def sink(device, adv):
+        if is_myo(device, adv):
+            queue.put_nowait((device, adv))
+
+    scanner = _get_scanner()
+    _scan_sink = sink
+    await scanner.start()
+    try:
+        deadline = loop.time() + timeout
+        while True:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return
+            yield item
+    finally:
+        await scanner.stop()
+        _scan_sink = None
@@ -16,26 +16,28 @@ Usage:
     python proportional_control.py              # Auto-detect stream
     python proportional_control.py --mock       # Use simulated EMG
     python proportional_control.py --stream Myo # Connect to specific stream
+    python proportional_control.py --envelope iir  # Rectify + low-pass envelope
 
 Author: BioRobotics Course
 Updated: 2025
 """
 
 import sys
+import math
 import time
+import inspect
 import threading
-from collections import deque
 from dataclasses import dataclass
 import numpy as np
+from scipy import signal as scipy_signal
 
 try:
     from PyQt6.QtWidgets import (
         QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout,
-        QPushButton, QLabel, QSlider, QComboBox, QGroupBox, QGridLayout,
-        QProgressBar
+        QPushButton, QLabel, QSlider, QComboBox, QGroupBox, QGridLayout
     )
-    from PyQt6.QtCore import QTimer, Qt
-    from PyQt6.QtGui import QPainter, QColor, QFont, QPen, QBrush
+    from PyQt6.QtCore import QTimer, Qt, QRect, QObject, QThread, QThreadPool, pyqtSignal
+    from PyQt6.QtGui import QPainter, QColor, QFont, QPen, QBrush, QPixmap
     import pyqtgraph as pg
     HAS_GUI = True
 except ImportError:
@@ -49,24 +51,58 @@ except ImportError:
 
 
 # pylsl API compatibility helpers
+def _accepts_positional(func, *names) -> bool:
+    """True unless one of the named parameters is keyword-only in func."""
+    try:
+        params = inspect.signature(func).parameters
+    except (TypeError, ValueError):
+        return True  # no introspectable signature; assume the older API
+    return all(name not in params or params[name].kind != inspect.Parameter.KEYWORD_ONLY
+               for name in names)
+
+
+# Decided once at import rather than by catching TypeError on every call
+if HAS_LSL:
+    _STREAMS_POSITIONAL = _accepts_positional(pylsl.resolve_streams, 'wait_time')
+    _BYPROP_POSITIONAL = _accepts_positional(pylsl.resolve_byprop, 'minimum', 'timeout')
+    
+    # numpy dtypes for numeric LSL channel formats, so pull_chunk can write
+    # straight into a preallocated array (dest_obj) instead of building lists
+    _LSL_DTYPES = {
+        pylsl.cf_float32: np.float32,
+        pylsl.cf_double64: np.float64,
+        pylsl.cf_int32: np.int32,
+        pylsl.cf_int16: np.int16,
+        pylsl.cf_int8: np.int8,
+    }
+
+# Upper bound on samples taken per pull_chunk (pylsl's default)
+_PULL_MAX_SAMPLES = 1024
+
+# Display refresh period. Acquisition runs on its own thread, so this only
+# paces repaints; the per-frame EMA alpha is rescaled from the 0.1 tuned for
+# 16 ms frames so the smoothing time constant stays the same.
+_GUI_INTERVAL_MS = 33
+_GUI_ALPHA = 1 - (1 - 0.1) ** (_GUI_INTERVAL_MS / 16)
+
+
 def _resolve_streams(wait_time: float = 1.0):
     """Resolve streams with API version compatibility."""
-    try:
-        # Try positional first (older API)
+    if _STREAMS_POSITIONAL:
         return pylsl.resolve_streams(wait_time)
-    except TypeError:
-        # Try keyword (newer API)
-        return pylsl.resolve_streams(wait_time=wait_time)
+    return pylsl.resolve_streams(wait_time=wait_time)
 
 
 def _resolve_byprop(prop: str, value: str, minimum: int = 1, timeout: float = 5.0):
     """Resolve streams by property with API version compatibility."""
-    try:
-        # Try positional first (older API)
+    if _BYPROP_POSITIONAL:
         return pylsl.resolve_byprop(prop, value, minimum, timeout)
-    except TypeError:
-        # Try keyword (newer API)
-        return pylsl.resolve_byprop(prop, value, minimum=minimum, timeout=timeout)
+    return pylsl.resolve_byprop(prop, value, minimum=minimum, timeout=timeout)
+
+
+def _clamp01(value: float) -> float:
+    """Clamp a scalar to [0, 1] as a plain float (np.clip is ufunc-slow here)."""
+    return 0.0 if value < 0.0 else 1.0 if value > 1.0 else float(value)
 
 
 @dataclass
@@ -79,172 +115,435 @@ class ControlConfig:
 
 
 class EMGProcessor:
-    """Real-time EMG processing for control."""
+    """
+    Real-time EMG processing for control.
+    
+    Two envelope modes:
+    - 'rms': windowed RMS followed by per-frame exponential smoothing
+    - 'iir': rectify, then a single-pole low-pass per sample (cutoff in
+      Hz at sampling rate fs); the window is then only used by calibrate()
+    """
     
-    def __init__(self, n_channels: int = 8, window_size: int = 50):
+    def __init__(self, n_channels: int = 8, window_size: int = 50,
+                 envelope: str = 'rms', fs: float = 200.0, cutoff: float = 25.0):
+        if envelope not in ('rms', 'iir'):
+            raise ValueError(f"Unknown envelope mode: {envelope!r}")
         self.n_channels = n_channels
         self.window_size = window_size
-        self.buffers = [deque(maxlen=window_size) for _ in range(n_channels)]
+        self.envelope = envelope
+        # Ring buffer, one row per channel; write_idx is the next column to
+        # overwrite and filled counts valid columns (caps at window_size)
+        self.buf = np.zeros((n_channels, window_size), dtype=np.float32)
+        self.write_idx = 0
+        self.filled = 0
         self.smoothed = np.zeros(n_channels)
-        self.baseline = np.zeros(n_channels)
+        self.baseline = np.zeros(n_channels)  # stays zero until calibrated
         self.calibrated = False
+        # Running per-channel sum of (sample - baseline)**2 over the window,
+        # so RMS is O(1) per frame instead of a pass over the window
+        self.sum_sq = np.zeros(n_channels, dtype=np.float64)
+        # IIR envelope state; alpha = dt / (tau + dt) with tau = 1 / (2*pi*fc)
+        self.env = np.zeros(n_channels)
+        dt = 1.0 / fs
+        self.env_alpha = dt / (1.0 / (2 * np.pi * cutoff) + dt)
     
     def add_sample(self, sample: list):
         """Add a new sample and compute control values."""
-        for i, val in enumerate(sample[:self.n_channels]):
-            self.buffers[i].append(val)
+        new = np.asarray(sample[:self.n_channels], dtype=np.float32)
+        if self.envelope == 'iir':
+            self.env += self.env_alpha * (np.abs(new - self.baseline) - self.env)
+        else:
+            if self.filled == self.window_size:
+                evicted = self.buf[:, self.write_idx] - self.baseline
+                self.sum_sq -= evicted * evicted
+            centered = new - self.baseline
+            self.sum_sq += centered * centered
+        self.buf[:, self.write_idx] = new
+        
+        self.write_idx = (self.write_idx + 1) % self.window_size
+        self.filled = min(self.filled + 1, self.window_size)
+        if self.write_idx == 0 and self.envelope == 'rms':
+            # Recompute once per lap so add/subtract rounding can't accumulate
+            self._resync_sum_sq()
+    
+    def add_sample_chunk(self, samples):
+        """
+        Add a (T, n_channels) block of samples, e.g. one pull_chunk result.
+        
+        Equivalent to calling add_sample on each row, but the IIR envelope
+        runs as one lfilter call over the block and the RMS sum of squares
+        is recomputed once instead of updated per sample.
+        """
+        chunk = np.asarray(samples, dtype=np.float32)
+        if chunk.ndim != 2 or len(chunk) == 0:
+            return
+        chunk = chunk[:, :self.n_channels]
+        n = len(chunk)
+        
+        if self.envelope == 'iir':
+            a = self.env_alpha
+            x = np.abs(chunk.T - self.baseline[:, None])
+            # y[n] = a*x[n] + (1-a)*y[n-1], seeded from the current envelope
+            y, _ = scipy_signal.lfilter([a], [1.0, a - 1.0], x, axis=1,
+                                        zi=((1.0 - a) * self.env)[:, None])
+            self.env = y[:, -1]
+        
+        # Only the last window_size samples survive in the ring
+        if n > self.window_size:
+            self.write_idx = (self.write_idx + n - self.window_size) % self.window_size
+            chunk = chunk[-self.window_size:]
+        cols = (self.write_idx + np.arange(len(chunk))) % self.window_size
+        self.buf[:, cols] = chunk.T
+        self.write_idx = (self.write_idx + len(chunk)) % self.window_size
+        self.filled = min(self.filled + n, self.window_size)
+        
+        if self.envelope == 'rms':
+            self._resync_sum_sq()
+    
+    def _resync_sum_sq(self):
+        data = self.buf[:, :self.filled] - self.baseline[:, None]
+        self.sum_sq = np.einsum('ij,ij->i', data, data)
     
     def get_activation(self, channel: int = 0, alpha: float = 0.1) -> float:
         """
         Get the activation level for a channel.
         
-        Uses RMS and exponential smoothing.
+        Uses RMS and exponential smoothing, or the IIR envelope.
         """
-        if len(self.buffers[channel]) < 10:
+        if self.envelope == 'iir':
+            return self.env[channel]
+        if self.filled < 10:
             return 0.0
         
-        # Compute RMS
-        data = np.array(self.buffers[channel])
-        if self.calibrated:
-            data = data - self.baseline[channel]
-        rms = np.sqrt(np.mean(data ** 2))
+        rms = np.sqrt(max(self.sum_sq[channel], 0.0) / self.filled)
         
         # Exponential smoothing
         self.smoothed[channel] = alpha * rms + (1 - alpha) * self.smoothed[channel]
         
         return self.smoothed[channel]
     
+    def get_activations_all(self, alpha: float = 0.1) -> np.ndarray:
+        """
+        Get the activation level for every channel at once.
+        
+        Same RMS and exponential smoothing as get_activation, vectorized
+        across channels. Returns the smoothed array itself (not a copy; it is
+        updated in place on the next call). In 'iir' mode this is the
+        envelope and alpha is unused.
+        """
+        if self.envelope == 'iir':
+            return self.env
+        if self.filled < 10:
+            return np.zeros(self.n_channels)
+        
+        # In place: one scratch array per call, no further temporaries
+        rms = np.maximum(self.sum_sq, 0.0)
+        rms /= self.filled
+        np.sqrt(rms, out=rms)
+        
+        rms -= self.smoothed
+        rms *= alpha
+        self.smoothed += rms  # smoothed += alpha * (rms - smoothed)
+        
+        return self.smoothed
+    
     def calibrate(self, duration: float = 2.0):
         """Calibrate baseline (call while at rest)."""
-        for i in range(self.n_channels):
-            if len(self.buffers[i]) > 10:
-                self.baseline[i] = np.mean(list(self.buffers[i]))
+        if self.filled > 10:
+            self.baseline = self.buf[:, :self.filled].mean(axis=1, dtype=np.float64)
+            self._resync_sum_sq()
         self.calibrated = True
         print("Calibration complete")
 
 
 if HAS_GUI and HAS_LSL:
     
+    def _new_pixmap(widget: QWidget) -> QPixmap:
+        """Transparent pixmap covering widget at its device pixel ratio."""
+        ratio = widget.devicePixelRatioF()
+        pixmap = QPixmap(int(widget.width() * ratio), int(widget.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        return pixmap
+
+
     class ControlVisualization(QWidget):
         """Widget for visualizing control output."""
         
+        MARGIN = 20
+        BAR_WIDTH = 80
+        
         def __init__(self, parent=None):
             super().__init__(parent)
             self.control_value = 0.0  # -1 to 1 for bidirectional, 0 to 1 for unidirectional
             self.target_value = 0.5   # Target to reach
             self.mode = 'bar'  # 'bar', 'cursor', or 'target'
+            # Values as of the last scheduled repaint; changes smaller than
+            # a pixel don't schedule another one
+            self._drawn_value = -1.0
+            self._drawn_target = -1.0
+            
+            # Pens, brushes and fonts are reused across paints rather than
+            # rebuilt at 60 Hz
+            self._pen_border = QPen(QColor(100, 100, 100), 2)
+            self._pen_track = QPen(QColor(100, 100, 100), 4)
+            self._pen_white = QPen(QColor(255, 255, 255))
+            self._brush_bg = QBrush(QColor(50, 50, 50))
+            self._font_value = QFont('Arial', 16, QFont.Weight.Bold)
+            self._font_error = QFont('Arial', 12)
+            self._pen_cursor = QPen(QColor(0, 200, 0), 2)
+            self._brush_cursor = QBrush(QColor(0, 255, 0))
+            self._pen_target = QPen(QColor(255, 200, 0), 2)
+            self._brush_target = QBrush(QColor(255, 200, 0, 100))
+            # Bar fill (blue -> green) indexed by round(control_value * 100)
+            self._fill_lut = [QBrush(QColor(0, int(255 * v), int(255 * (1 - v))))
+                              for v in np.linspace(0, 1, 101)]
+            # Tracking cursor: on target / close / far
+            self._error_styles = [(QPen(c, 2), QBrush(c)) for c in
+                                  (QColor(0, 255, 0), QColor(255, 255, 0), QColor(255, 100, 100))]
+            
             self.setMinimumSize(400, 200)
+            self._update_geometry()
+        
+        def _update_geometry(self):
+            """Recompute size-dependent layout; called on resize."""
+            self._bg_cache = {}  # mode -> static background pixmap
+            w, h = self.width(), self.height()
+            self._w, self._h = w, h
+            self._bar_x = w // 2 - self.BAR_WIDTH // 2
+            self._bar_height = h - 2 * self.MARGIN
+            self._track_y = h // 2
+            self._track_width = w - 2 * self.MARGIN
+        
+        def resizeEvent(self, event):
+            self._update_geometry()
+            super().resizeEvent(event)
         
         def set_value(self, value: float):
             """Set the control value (0-1)."""
-            self.control_value = np.clip(value, 0, 1)
-            self.update()
+            self.control_value = _clamp01(value)
+            span = self._bar_height if self.mode == 'bar' else self._track_width
+            if abs(self.control_value - self._drawn_value) * span >= 1.0:
+                self._drawn_value = self.control_value
+                self.update()
         
         def set_target(self, value: float):
             """Set target value for target tracking mode."""
-            self.target_value = np.clip(value, 0, 1)
-            self.update()
+            self.target_value = _clamp01(value)
+            if abs(self.target_value - self._drawn_target) * self._track_width >= 1.0:
+                self._drawn_target = self.target_value
+                self.update()
+        
+        def _background(self) -> 'QPixmap':
+            """Static layer (bar frame or track) for the current mode and size."""
+            pixmap = self._bg_cache.get(self.mode)
+            if pixmap is None:
+                pixmap = _new_pixmap(self)
+                painter = QPainter(pixmap)
+                painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+                if self.mode == 'bar':
+                    painter.setPen(self._pen_border)
+                    painter.setBrush(self._brush_bg)
+                    painter.drawRect(self._bar_x, self.MARGIN, self.BAR_WIDTH, self._bar_height)
+                else:
+                    painter.setPen(self._pen_track)
+                    painter.drawLine(self.MARGIN, self._track_y, self._w - self.MARGIN, self._track_y)
+                painter.end()
+                self._bg_cache[self.mode] = pixmap
+            return pixmap
         
         def paintEvent(self, event):
             painter = QPainter(self)
+            painter.drawPixmap(0, 0, self._background())
             painter.setRenderHint(QPainter.RenderHint.Antialiasing)
             
-            w, h = self.width(), self.height()
-            margin = 20
-            
             if self.mode == 'bar':
-                self._draw_bar(painter, w, h, margin)
+                self._draw_bar(painter)
             elif self.mode == 'cursor':
-                self._draw_cursor(painter, w, h, margin)
+                self._draw_cursor(painter)
             elif self.mode == 'target':
-                self._draw_target(painter, w, h, margin)
+                self._draw_target(painter)
         
-        def _draw_bar(self, painter, w, h, margin):
+        def _draw_bar(self, painter):
             """Draw a vertical bar indicator."""
-            bar_width = 80
-            bar_x = w // 2 - bar_width // 2
-            bar_height = h - 2 * margin
+            margin, bar_x, bar_height = self.MARGIN, self._bar_x, self._bar_height
             
-            # Background
-            painter.setPen(QPen(QColor(100, 100, 100), 2))
-            painter.setBrush(QBrush(QColor(50, 50, 50)))
-            painter.drawRect(bar_x, margin, bar_width, bar_height)
-            
-            # Fill based on control value
+            # Fill based on control value (frame comes from _background)
+            painter.setPen(self._pen_border)
             fill_height = int(bar_height * self.control_value)
-            color = QColor(0, int(255 * self.control_value), int(255 * (1 - self.control_value)))
-            painter.setBrush(QBrush(color))
-            painter.drawRect(bar_x, margin + bar_height - fill_height, bar_width, fill_height)
+            painter.setBrush(self._fill_lut[int(round(self.control_value * 100))])
+            painter.drawRect(bar_x, margin + bar_height - fill_height, self.BAR_WIDTH, fill_height)
             
             # Value text
-            painter.setPen(QPen(QColor(255, 255, 255)))
-            painter.setFont(QFont('Arial', 16, QFont.Weight.Bold))
-            painter.drawText(bar_x, h - 5, f'{self.control_value:.2f}')
+            painter.setPen(self._pen_white)
+            painter.setFont(self._font_value)
+            painter.drawText(bar_x, self._h - 5, f'{self.control_value:.2f}')
         
-        def _draw_cursor(self, painter, w, h, margin):
-            """Draw a horizontal cursor."""
-            track_y = h // 2
-            track_width = w - 2 * margin
-            
-            # Track
-            painter.setPen(QPen(QColor(100, 100, 100), 4))
-            painter.drawLine(margin, track_y, w - margin, track_y)
-            
+        def _draw_cursor(self, painter):
+            """Draw a horizontal cursor (track comes from _background)."""
             # Cursor
-            cursor_x = margin + int(track_width * self.control_value)
-            painter.setPen(QPen(QColor(0, 200, 0), 2))
-            painter.setBrush(QBrush(QColor(0, 255, 0)))
-            painter.drawEllipse(cursor_x - 15, track_y - 15, 30, 30)
+            cursor_x = self.MARGIN + int(self._track_width * self.control_value)
+            painter.setPen(self._pen_cursor)
+            painter.setBrush(self._brush_cursor)
+            painter.drawEllipse(cursor_x - 15, self._track_y - 15, 30, 30)
         
-        def _draw_target(self, painter, w, h, margin):
-            """Draw cursor with target to track."""
-            track_y = h // 2
-            track_width = w - 2 * margin
-            
-            # Track
-            painter.setPen(QPen(QColor(100, 100, 100), 4))
-            painter.drawLine(margin, track_y, w - margin, track_y)
+        def _draw_target(self, painter):
+            """Draw cursor with target to track (track comes from _background)."""
+            margin, track_y = self.MARGIN, self._track_y
             
             # Target zone
-            target_x = margin + int(track_width * self.target_value)
-            painter.setPen(QPen(QColor(255, 200, 0), 2))
-            painter.setBrush(QBrush(QColor(255, 200, 0, 100)))
+            target_x = margin + int(self._track_width * self.target_value)
+            painter.setPen(self._pen_target)
+            painter.setBrush(self._brush_target)
             painter.drawRect(target_x - 20, track_y - 30, 40, 60)
             
-            # Cursor
-            cursor_x = margin + int(track_width * self.control_value)
+            # Cursor: green when on target, yellow when close, red when far
+            cursor_x = margin + int(self._track_width * self.control_value)
             error = abs(self.control_value - self.target_value)
-            if error < 0.05:
-                color = QColor(0, 255, 0)  # Green when on target
-            elif error < 0.15:
-                color = QColor(255, 255, 0)  # Yellow when close
-            else:
-                color = QColor(255, 100, 100)  # Red when far
-            
-            painter.setPen(QPen(color, 2))
-            painter.setBrush(QBrush(color))
+            pen, brush = self._error_styles[0 if error < 0.05 else 1 if error < 0.15 else 2]
+            painter.setPen(pen)
+            painter.setBrush(brush)
             painter.drawEllipse(cursor_x - 15, track_y - 15, 30, 30)
             
             # Score text
-            painter.setPen(QPen(QColor(255, 255, 255)))
-            painter.setFont(QFont('Arial', 12))
-            painter.drawText(margin, h - 10, f'Error: {error:.3f}')
+            painter.setPen(self._pen_white)
+            painter.setFont(self._font_error)
+            painter.drawText(margin, self._h - 10, f'Error: {error:.3f}')
+
+
+    class ChannelBarsWidget(QWidget):
+        """Per-channel activation bars (0-100), all drawn in one paintEvent."""
+        
+        LABEL_HEIGHT = 18
+        
+        def __init__(self, n_bars: int = 8, parent=None):
+            super().__init__(parent)
+            self.values = np.zeros(n_bars, dtype=np.int32)
+            self._labels = [f"Ch{i+1}" for i in range(n_bars)]
+            self._pen_border = QPen(QColor(100, 100, 100), 1)
+            self._pen_text = QPen(QColor(200, 200, 200))
+            self._brush_bg = QBrush(QColor(50, 50, 50))
+            self._brush_fill = QBrush(QColor(0, 170, 255))
+            self._bg = None  # frames + labels, re-rendered on resize
+            self.setMinimumHeight(100 + self.LABEL_HEIGHT)
+        
+        def set_values(self, values):
+            """Set bar levels (clipped to 0-100); repaints only if one changed."""
+            # Scale-clamp-truncate in one pass; bars without a channel read 0
+            levels = np.clip(values[:len(self.values)], 0, 100).astype(np.int32)
+            if len(levels) < len(self.values):
+                levels = np.pad(levels, (0, len(self.values) - len(levels)))
+            if not np.array_equal(levels, self.values):
+                self.values = levels
+                self.update()
+        
+        def resizeEvent(self, event):
+            self._bg = None
+            super().resizeEvent(event)
+        
+        def _geometry(self):
+            slot = self.width() / len(self.values)
+            return slot, int(slot * 0.6), self.height() - self.LABEL_HEIGHT - 2
+        
+        def _background(self) -> 'QPixmap':
+            """Bar frames and channel labels, rendered once per size."""
+            if self._bg is None:
+                slot, bar_w, bar_h = self._geometry()
+                self._bg = _new_pixmap(self)
+                painter = QPainter(self._bg)
+                for i, label in enumerate(self._labels):
+                    x = int(i * slot + (slot - bar_w) / 2)
+                    painter.setPen(self._pen_border)
+                    painter.setBrush(self._brush_bg)
+                    painter.drawRect(x, 1, bar_w, bar_h)
+                    painter.setPen(self._pen_text)
+                    painter.drawText(QRect(int(i * slot), bar_h + 2, int(slot), self.LABEL_HEIGHT),
+                                     Qt.AlignmentFlag.AlignCenter, label)
+                painter.end()
+            return self._bg
+        
+        def paintEvent(self, event):
+            painter = QPainter(self)
+            painter.drawPixmap(0, 0, self._background())
+            slot, bar_w, bar_h = self._geometry()
+            
+            for i, level in enumerate(self.values):
+                x = int(i * slot + (slot - bar_w) / 2)
+                fill = bar_h * int(level) // 100
+                painter.fillRect(x + 1, 1 + bar_h - fill, bar_w - 1, fill, self._brush_fill)
+
+
+    class StreamScanner(QObject):
+        """
+        Resolves LSL streams off the GUI thread.
+        
+        Run via QThreadPool; emits finished with a list of
+        (combo label, stream name) pairs.
+        """
+        
+        finished = pyqtSignal(list)
+        
+        def __init__(self, wait_time: float = 1.0):
+            super().__init__()
+            self.wait_time = wait_time
+        
+        def run(self):
+            try:
+                streams = _resolve_streams(self.wait_time)
+            except Exception as e:
+                print(f"Stream scan failed: {e}")
+                streams = []
+            self.finished.emit([(f"{s.name()} ({s.type()})", s.name()) for s in streams])
+
+
+    class AcquisitionThread(QThread):
+        """
+        Feeds an EMGProcessor off the GUI thread.
+        
+        read_chunk blocks briefly and returns a (T, C) block (or nothing);
+        each block is added under lock, which the GUI also takes to read
+        activations.
+        """
+        
+        def __init__(self, read_chunk, processor, lock):
+            super().__init__()
+            self.read_chunk = read_chunk
+            self.processor = processor
+            self.lock = lock
+        
+        def run(self):
+            while not self.isInterruptionRequested():
+                try:
+                    chunk = self.read_chunk()
+                except Exception as e:
+                    print(f"Acquisition stopped: {e}")
+                    return
+                if chunk is not None and len(chunk):
+                    with self.lock:
+                        self.processor.add_sample_chunk(chunk)
 
 
     class ProportionalControlDemo(QMainWindow):
         """Main window for the proportional control demo."""
         
-        def __init__(self):
+        def __init__(self, envelope: str = 'rms'):
             super().__init__()
             self.setWindowTitle("EMG Proportional Control Demo")
             self.setGeometry(100, 100, 800, 600)
             
             # State
             self.inlet = None
+            self._pull_buf = None  # pull_chunk destination for numeric streams
             self.processor = None
+            self.acquisition = None  # AcquisitionThread while connected
+            self._target_phase = 0.0  # tracking-mode target sinusoid phase (rad)
+            self._lock = threading.Lock()  # guards self.processor across threads
             self.running = False
             self.selected_channel = 0
+            self.envelope = envelope  # EMGProcessor envelope mode
             self.config = ControlConfig()
+            self._scanner = None  # StreamScanner in flight, if any
+            self.auto_connect_stream = None  # connect to this once a scan finds it
             
             self.setup_ui()
             
@@ -265,6 +564,7 @@ if HAS_GUI and HAS_LSL:
             # Stream selection
             control_layout.addWidget(QLabel("Stream:"), 0, 0)
             self.stream_combo = QComboBox()
+            self.stream_combo.addItem("Mock EMG (Testing)", "mock")  # always first
             control_layout.addWidget(self.stream_combo, 0, 1)
             
             self.refresh_btn = QPushButton("Refresh")
@@ -319,18 +619,8 @@ if HAS_GUI and HAS_LSL:
             # === Channel bars ===
             bars_group = QGroupBox("All Channels")
             bars_layout = QHBoxLayout(bars_group)
-            self.channel_bars = []
-            for i in range(8):
-                vbox = QVBoxLayout()
-                bar = QProgressBar()
-                bar.setOrientation(Qt.Orientation.Vertical)
-                bar.setRange(0, 100)
-                bar.setValue(0)
-                bar.setMinimumHeight(100)
-                vbox.addWidget(bar)
-                vbox.addWidget(QLabel(f"Ch{i+1}"))
-                bars_layout.addLayout(vbox)
-                self.channel_bars.append(bar)
+            self.channel_bars_widget = ChannelBarsWidget(8)
+            bars_layout.addWidget(self.channel_bars_widget)
             layout.addWidget(bars_group)
             
             # === Instructions ===
@@ -347,17 +637,36 @@ if HAS_GUI and HAS_LSL:
             self.refresh_streams()
         
         def refresh_streams(self):
-            """Scan for LSL streams."""
-            self.stream_combo.clear()
-            
-            # Add mock option
-            self.stream_combo.addItem("Mock EMG (Testing)", "mock")
-            
-            # Scan for real streams
-            streams = _resolve_streams(1.0)
-            for stream in streams:
-                name = stream.name()
-                self.stream_combo.addItem(f"{name} ({stream.type()})", name)
+            """Scan for LSL streams in the background (the scan takes ~1 s)."""
+            if self._scanner is not None:
+                return  # a scan is already running
+            self._scanner = StreamScanner(1.0)
+            self._scanner.finished.connect(self._on_streams_found)
+            self.refresh_btn.setEnabled(False)
+            QThreadPool.globalInstance().start(self._scanner.run)
+        
+        def _on_streams_found(self, found):
+            """Update the stream list, touching only entries that changed."""
+            self._scanner = None
+            self.refresh_btn.setEnabled(True)
+            
+            labels = {label for label, _ in found}
+            # Index 0 is the mock option and always stays
+            for i in range(self.stream_combo.count() - 1, 0, -1):
+                if self.stream_combo.itemText(i) not in labels:
+                    self.stream_combo.removeItem(i)
+            present = {self.stream_combo.itemText(i) for i in range(1, self.stream_combo.count())}
+            for label, name in found:
+                if label not in present:
+                    self.stream_combo.addItem(label, name)
+            
+            if self.auto_connect_stream and not self.running:
+                wanted, self.auto_connect_stream = self.auto_connect_stream, None
+                for i in range(self.stream_combo.count()):
+                    if wanted in self.stream_combo.itemText(i):
+                        self.stream_combo.setCurrentIndex(i)
+                        self.connect()
+                        break
         
         def toggle_connection(self):
             """Connect or disconnect."""
@@ -373,6 +682,7 @@ if HAS_GUI and HAS_LSL:
             if stream_name == "mock":
                 # Start mock data generator
                 self.start_mock()
+                read_chunk = self._read_mock_chunk
             else:
                 # Connect to real stream
                 streams = _resolve_byprop("name", stream_name, timeout=2.0)
@@ -381,23 +691,81 @@ if HAS_GUI and HAS_LSL:
                 
                 self.inlet = pylsl.StreamInlet(streams[0], max_buflen=360)
                 n_channels = streams[0].channel_count()
-                self.processor = EMGProcessor(n_channels)
+                fs = streams[0].nominal_srate() or 200.0  # 0 = irregular rate
+                self.processor = EMGProcessor(n_channels, envelope=self.envelope, fs=fs)
+                
+                # Reused every pull; None (list pulls) for non-numeric formats
+                dtype = _LSL_DTYPES.get(streams[0].channel_format())
+                self._pull_buf = (np.empty((_PULL_MAX_SAMPLES, n_channels), dtype=dtype)
+                                  if dtype is not None else None)
+                read_chunk = self._read_inlet_chunk
             
             self.running = True
-            self.timer.start(16)  # ~60 Hz
+            self.acquisition = AcquisitionThread(read_chunk, self.processor, self._lock)
+            self.acquisition.start()
+            self.timer.start(_GUI_INTERVAL_MS)
             self.connect_btn.setText("Disconnect")
             self.calibrate_btn.setEnabled(True)
         
         def start_mock(self):
             """Start mock data generation."""
-            self.processor = EMGProcessor(8)
+            # 16 mock samples per 16 ms tick, i.e. 1 kHz
+            self.processor = EMGProcessor(8, envelope=self.envelope, fs=1000.0)
             self.mock_t = 0
+            self._rng = np.random.default_rng()
+            self._mock_dt = np.arange(16) * 0.001
+            # Refilled in place every tick (the processor copies it into its
+            # ring buffer before the next one)
+            self._mock_chunk = np.empty((16, 8), dtype=np.float32)
+            self._mock_act = np.empty(16)
+            self._mock_deadline = time.perf_counter()
             self.inlet = None
         
+        def _read_inlet_chunk(self):
+            """Acquisition-thread source: wait up to 20 ms for LSL samples."""
+            if self._pull_buf is not None:
+                try:
+                    _, timestamps = self.inlet.pull_chunk(
+                        timeout=0.02, max_samples=_PULL_MAX_SAMPLES, dest_obj=self._pull_buf)
+                except (TypeError, ValueError):
+                    # This pylsl can't fill the buffer; use list pulls from now on
+                    self._pull_buf = None
+                else:
+                    return self._pull_buf[:len(timestamps)]
+            samples, _ = self.inlet.pull_chunk(timeout=0.02)
+            return samples
+        
+        def _read_mock_chunk(self):
+            """Acquisition-thread source: one 16 ms tick of mock data."""
+            self._mock_deadline += 0.016
+            delay = self._mock_deadline - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            
+            # Noise on every channel plus a slow time-varying activation on
+            # the selected one
+            act = self._mock_act
+            np.add(self._mock_dt, self.mock_t, out=act)
+            self.mock_t += 0.016
+            act *= 2
+            np.sin(act, out=act)
+            act *= 15
+            act += 15  # 30 * (0.5 + 0.5 * sin(2t))
+            
+            chunk = self._mock_chunk
+            self._rng.standard_normal(dtype=np.float32, out=chunk)
+            chunk *= 5
+            chunk[:, self.selected_channel] += act
+            return chunk
+        
         def disconnect(self):
             """Disconnect from stream."""
             self.running = False
             self.timer.stop()
+            if self.acquisition is not None:
+                self.acquisition.requestInterruption()
+                self.acquisition.wait()
+                self.acquisition = None
             self.inlet = None
             self.connect_btn.setText("Connect")
             self.calibrate_btn.setEnabled(False)
@@ -405,7 +773,8 @@ if HAS_GUI and HAS_LSL:
         def calibrate(self):
             """Calibrate baseline."""
             if self.processor:
-                self.processor.calibrate()
+                with self._lock:
+                    self.processor.calibrate()
         
         def change_mode(self, mode_text):
             """Change visualization mode."""
@@ -414,47 +783,31 @@ if HAS_GUI and HAS_LSL:
             self.viz.update()
         
         def update(self):
-            """Update loop."""
+            """Update loop (display only; samples arrive on the acquisition thread)."""
             if not self.running or not self.processor:
                 return
             
-            # Get data
-            if self.inlet:
-                samples, _ = self.inlet.pull_chunk(timeout=0.0)
-                for sample in samples:
-                    self.processor.add_sample(sample)
-            else:
-                # Generate mock data
-                self.mock_t += 0.016
-                sample = []
-                for ch in range(8):
-                    # Simulate some activation on selected channel
-                    base = np.random.randn() * 5
-                    if ch == self.selected_channel:
-                        # Add time-varying activation
-                        activation = 30 * (0.5 + 0.5 * np.sin(self.mock_t * 2))
-                        base += activation
-                    sample.append(base)
-                self.processor.add_sample(sample)
-            
             # Update gain label
             self.gain_label.setText(f"{self.config.gain:.1f}")
             
+            # One smoothing step for all channels per frame; copied so the
+            # acquisition thread can't change it while we draw
+            with self._lock:
+                acts = self.processor.get_activations_all(_GUI_ALPHA).copy()
+            
             # Update channel bars
-            for i in range(min(8, len(self.channel_bars))):
-                activation = self.processor.get_activation(i) * self.config.gain
-                self.channel_bars[i].setValue(int(min(100, activation)))
+            self.channel_bars_widget.set_values(acts * self.config.gain)
             
             # Update main visualization
-            activation = self.processor.get_activation(self.selected_channel)
-            control = np.clip(activation * self.config.gain / 100, 0, 1)
+            activation = acts[self.selected_channel]
+            control = _clamp01(activation * self.config.gain / 100)
             self.viz.set_value(control)
             
             # Update target in tracking mode
             if self.viz.mode == 'target':
-                # Slowly moving target
-                t = time.time()
-                target = 0.5 + 0.4 * np.sin(t * 0.5)
+                # Slowly moving target (0.5 rad/s), advanced per timer tick
+                self._target_phase += 0.5 * _GUI_INTERVAL_MS / 1000
+                target = 0.5 + 0.4 * math.sin(self._target_phase)
                 self.viz.set_target(target)
         
         def closeEvent(self, event):
@@ -476,21 +829,20 @@ def main():
     parser = argparse.ArgumentParser(description="EMG Proportional Control Demo")
     parser.add_argument("--stream", help="Stream name to connect to")
     parser.add_argument("--mock", action="store_true", help="Use mock data")
+    parser.add_argument("--envelope", choices=["rms", "iir"], default="rms",
+                        help="Envelope: windowed RMS or rectify + low-pass IIR")
     args = parser.parse_args()
     
     app = QApplication(sys.argv)
-    window = ProportionalControlDemo()
+    window = ProportionalControlDemo(envelope=args.envelope)
     window.show()
     
     if args.mock:
         window.stream_combo.setCurrentIndex(0)  # Select mock
         window.connect()
     elif args.stream:
-        for i in range(window.stream_combo.count()):
-            if args.stream in window.stream_combo.itemText(i):
-                window.stream_combo.setCurrentIndex(i)
-                window.connect()
-                break
+        # Streams are scanned in the background; connect once the scan is in
+        window.auto_connect_stream = args.stream
     
     return app.exec()
 
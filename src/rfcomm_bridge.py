@@ -33,6 +33,7 @@ import sys
 import time
 import threading
 import logging
+import queue
 from collections import deque
 from typing import Optional
 
@@ -51,29 +52,125 @@ except ImportError as e:
 
 logger = logging.getLogger(__name__)
 
+# SDP UUIDs, built once rather than per query
+_SPP_UUID = IOBluetooth.IOBluetoothSDPUUID.uuid16_(0x1101)     # Serial Port Profile
+_RFCOMM_UUID = IOBluetooth.IOBluetoothSDPUUID.uuid16_(0x0003)  # RFCOMM protocol
+
+# Selector name -> whether its output argument must be passed as None.
+# Newer PyObjC wants the placeholder, older releases reject it; learned on
+# the first call so later calls don't raise and retry.
+_OUTPUT_PLACEHOLDER = {}
+
+
+def _call_with_output(obj, selector: str):
+    """
+    Call a selector whose only argument is an output pointer
+    (e.g. getRFCOMMChannelID_) and return its (result, value) tuple.
+    """
+    method = getattr(obj, selector)
+    placeholder = _OUTPUT_PLACEHOLDER.get(selector)
+    if placeholder is None:
+        try:
+            ret = method(None)
+        except TypeError:
+            _OUTPUT_PLACEHOLDER[selector] = False
+            return method()
+        _OUTPUT_PLACEHOLDER[selector] = True
+        return ret
+    return method(None) if placeholder else method()
+
 
 # ---------------------------------------------------------------------------
 # RFCOMM Channel Delegate
 # ---------------------------------------------------------------------------
+
+# Used when the channel's MTU can't be read (RFCOMM default frame size)
+_DEFAULT_RFCOMM_MTU = 127
+
+# Receive ring capacity in bytes (power of two); several seconds of BioRadio
+# data if the reader stalls
+_RX_RING_SIZE = 1 << 18
+_RX_RING_MASK = _RX_RING_SIZE - 1
+
+# Async writes allowed on the air at once; the next frame is sent while the
+# previous ones are still being acknowledged
+_MAX_TX_IN_FLIGHT = 3
+
+
 class _RFCOMMDelegate(Foundation.NSObject):
     """
     Objective-C delegate that receives callbacks from IOBluetoothRFCOMMChannel.
-    Data arrives asynchronously and is buffered in a thread-safe deque.
+
+    Data arrives asynchronously on the RunLoop thread and is copied into a
+    preallocated lock-free single-producer/single-consumer byte ring:
+      - only the RunLoop thread writes _tail (total bytes ever stored)
+      - only the reader writes _head (total bytes ever consumed)
+    so the bytes in [_head, _tail) are readable and neither side allocates
+    per packet beyond the reader's result. This relies on CPython's GIL
+    making each int/reference store atomic and visible to the other thread;
+    it is not safe on free-threaded builds.
     """
 
     def init(self):
         self = objc.super(_RFCOMMDelegate, self).init()
         if self is None:
             return None
-        self._buffer = deque()
-        self._buffer_lock = threading.Lock()
+        self._rx = bytearray(_RX_RING_SIZE)
+        self._rx_view = memoryview(self._rx)
+        self._head = 0              # bytes consumed (reader only)
+        self._tail = 0              # bytes stored (RunLoop thread only)
+        self._dropped = 0           # bytes lost to a full ring
+        self._rx_direct = True      # read the data pointer via as_buffer()
         self._data_event = threading.Event()
         self._is_open = False
         self._open_event = threading.Event()
         self._open_error = None
+        self._any_open_event = None  # shared Event set too, for parallel probes
+        # Device-level completions (this object is also the device target)
+        self._sdp_event = threading.Event()
+        self._sdp_status = None
+        self._connection_event = threading.Event()
+        self._connection_status = None
         self._closed_event = threading.Event()
+        # Async writes not yet completed, oldest first. Each frame's bytes are
+        # kept referenced until IOBluetooth reports it sent.
+        self._tx_cond = threading.Condition()
+        self._tx_in_flight = deque()
+        self._tx_error = None
+        # Checked once: per-packet debug lines are skipped without building them
+        self._debug = logger.isEnabledFor(logging.DEBUG)
         return self
 
+    def reset(self):
+        """Clear channel-open state so the delegate can be reused for another attempt."""
+        self._is_open = False
+        self._open_error = None
+        self._any_open_event = None
+        self._open_event.clear()
+        self._closed_event.clear()
+        with self._tx_cond:
+            self._tx_in_flight.clear()
+            self._tx_error = None
+
+    def _tx_done(self, status, data=None):
+        """
+        Retire an async write: the oldest one, or `data` itself when its
+        submission failed and no completion callback will follow.
+        """
+        with self._tx_cond:
+            in_flight = self._tx_in_flight
+            if data is None:
+                if in_flight:
+                    in_flight.popleft()
+            else:
+                for i, frame in enumerate(in_flight):
+                    if frame is data:
+                        del in_flight[i]
+                        break
+            if status != 0 and self._tx_error is None:
+                self._tx_error = status
+            self._tx_cond.notify_all()
+
     # --- IOBluetoothRFCOMMChannel delegate methods ---
 
     def rfcommChannelOpenComplete_status_(self, channel, status):
@@ -85,15 +182,66 @@ class _RFCOMMDelegate(Foundation.NSObject):
             logger.error(f"RFCOMM channel open failed with status: {status}")
             self._open_error = status
         self._open_event.set()
+        if self._any_open_event is not None:
+            self._any_open_event.set()
+
+    def sdpQueryComplete_status_(self, device, status):
+        """Called when performSDPQuery_ (with this object as target) finishes."""
+        logger.debug(f"SDP query complete, status {status}")
+        self._sdp_status = status
+        self._sdp_event.set()
+
+    def connectionComplete_status_(self, device, status):
+        """Called when openConnection_ (with this object as target) finishes."""
+        logger.debug(f"Baseband connection complete, status {status}")
+        self._connection_status = status
+        self._connection_event.set()
 
     def rfcommChannelData_data_length_(self, channel, data, length):
         """Called when data arrives on the RFCOMM channel."""
-        # data is a raw pointer — convert to bytes
-        raw_bytes = bytes(data[:length])
-        with self._buffer_lock:
-            self._buffer.extend(raw_bytes)
+        # data is a raw pointer (objc.varlist). as_buffer() exposes it as a
+        # memoryview so it's copied into the ring in one memcpy; slicing
+        # would build the bytes through Python one element at a time
+        raw_bytes = None
+        if self._rx_direct:
+            try:
+                raw_bytes = data.as_buffer(length)
+                if raw_bytes.nbytes != length:
+                    raise ValueError(f"unexpected element size {raw_bytes.itemsize}")
+                raw_bytes = raw_bytes.cast("B")
+            except (AttributeError, TypeError, ValueError) as e:
+                logger.debug(f"RFCOMM RX: falling back to slicing the data pointer ({e})")
+                self._rx_direct = False
+                raw_bytes = None
+        if raw_bytes is None:
+            raw_bytes = bytes(data[:length])
+        n = len(raw_bytes)
+        if not n:
+            return
+        tail = self._tail
+        if n > _RX_RING_SIZE - (tail - self._head):
+            if not self._dropped:
+                logger.warning("RFCOMM receive ring full; dropping data until the reader catches up")
+            self._dropped += n
+            return
+        # Copy in, in two pieces if it wraps past the end of the ring
+        start = tail & _RX_RING_MASK
+        first = min(n, _RX_RING_SIZE - start)
+        self._rx[start:start + first] = raw_bytes[:first] if first < n else raw_bytes
+        if first < n:
+            self._rx[:n - first] = raw_bytes[first:]
+        self._tail = tail + n  # publishes the bytes
+        # Set after every publish: the reader clears the event and then
+        # re-checks the ring, so a set that follows the store can't be lost
         self._data_event.set()
-        logger.debug(f"RFCOMM RX: {len(raw_bytes)} bytes")
+        if self._debug:
+            logger.debug(f"RFCOMM RX: {n} bytes")
+
+    def rfcommChannelWriteComplete_refcon_status_(self, channel, refcon, status):
+        """Called when a writeAsync frame has been sent (or failed)."""
+        if status != 0:
+            logger.error(f"RFCOMM async write failed with status: {status}")
+        self._tx_done(status)
 
     def rfcommChannelClosed_(self, channel):
         """Called when the RFCOMM channel is closed."""
@@ -102,34 +250,105 @@ class _RFCOMMDelegate(Foundation.NSObject):
         self._closed_event.set()
         self._data_event.set()  # Wake up any blocking reads
 
-    # --- Buffer access methods (called from Python threads) ---
+    # --- Buffer access methods (called from the reading thread) ---
 
     @property
     def in_waiting(self) -> int:
-        with self._buffer_lock:
-            return len(self._buffer)
+        return self._tail - self._head
 
     def read_bytes(self, count: int) -> bytes:
         """Read up to count bytes from the buffer."""
-        with self._buffer_lock:
-            available = min(count, len(self._buffer))
-            if available == 0:
-                return b""
-            result = bytes([self._buffer.popleft() for _ in range(available)])
-            if not self._buffer:
-                self._data_event.clear()
-            return result
+        head = self._head
+        n = min(count, self._tail - head)
+        if n <= 0:
+            self._clear_data_event()
+            return b""
+        start = head & _RX_RING_MASK
+        end = start + n
+        if end <= _RX_RING_SIZE:
+            result = bytes(self._rx_view[start:end])
+        else:
+            result = bytes(self._rx_view[start:]) + bytes(self._rx_view[:end - _RX_RING_SIZE])
+        self._head = head + n  # frees the bytes for the producer
+        if self._head == self._tail:
+            self._clear_data_event()
+        return result
+
+    def read_into(self, buf, offset: int, size: int) -> int:
+        """
+        Copy up to size bytes from the buffer into buf[offset:offset+size].
+
+        Returns the number of bytes copied. Avoids building an intermediate
+        bytes object when the caller parses into its own bytearray.
+        """
+        head = self._head
+        n = min(size, self._tail - head)
+        if n <= 0:
+            self._clear_data_event()
+            return 0
+        start = head & _RX_RING_MASK
+        end = start + n
+        if end <= _RX_RING_SIZE:
+            buf[offset:offset + n] = self._rx_view[start:end]
+        else:
+            first = _RX_RING_SIZE - start
+            buf[offset:offset + first] = self._rx_view[start:]
+            buf[offset + first:offset + n] = self._rx_view[:n - first]
+        self._head = head + n  # frees the bytes for the producer
+        if self._head == self._tail:
+            self._clear_data_event()
+        return n
+
+    def _clear_data_event(self):
+        """Clear the data event, re-setting it if data raced in meanwhile."""
+        self._data_event.clear()
+        if self._head != self._tail:
+            self._data_event.set()
 
     def clear_buffer(self):
         """Discard all buffered data."""
-        with self._buffer_lock:
-            self._buffer.clear()
-            self._data_event.clear()
+        self._head = self._tail
+        self._clear_data_event()
+
+
+def _open_rfcomm_channel(device, channel_id: int, delegate, use_async: bool):
+    """
+    Call IOBluetooth's sync or async RFCOMM open. Must run on the RunLoop
+    thread. Returns (IOKit result, channel).
+    """
+    if use_async:
+        method = device.openRFCOMMChannelAsync_withChannelID_delegate_
+    else:
+        method = device.openRFCOMMChannelSync_withChannelID_delegate_
+    try:
+        return method(None, channel_id, delegate)
+    except TypeError:
+        # Older PyObjC may not pass the output parameter
+        return method(channel_id, delegate)
 
 
 # ---------------------------------------------------------------------------
 # RunLoop Thread
 # ---------------------------------------------------------------------------
+class _RunLoopWaker(Foundation.NSObject):
+    """
+    performSelector:onThread: target for _RunLoopThread.
+
+    Performing a selector on the RunLoop thread wakes its run loop
+    immediately, so queued work runs without the loop having to poll.
+    """
+
+    def initWithOwner_(self, owner):
+        self = objc.super(_RunLoopWaker, self).init()
+        if self is None:
+            return None
+        self._owner = owner
+        return self
+
+    def drainWork_(self, _unused):
+        self._owner._drain_work()
+
+
 class _RunLoopThread(threading.Thread):
     """
     Runs the Cocoa NSRunLoop on a dedicated thread.
@@ -139,7 +358,9 @@ class _RunLoopThread(threading.Thread):
       1. Open the RFCOMM channel FROM this thread
       2. Run the NSRunLoop ON this thread to receive callbacks
 
-    Use schedule_and_wait() to execute callables on this thread.
+    Use schedule_and_wait() to execute callables on this thread. The run
+    loop sleeps until an IOBluetooth callback or a scheduled work item
+    arrives rather than waking up periodically to check for work.
     """
 
     def __init__(self):
@@ -147,39 +368,65 @@ class _RunLoopThread(threading.Thread):
         self._stop_event = threading.Event()
         self._started_event = threading.Event()
         self._run_loop = None
+        self._ns_thread = None
+        self._waker = _RunLoopWaker.alloc().initWithOwner_(self)
         # Queue for work items to execute on the run loop thread
-        self._work_queue = deque()
-        self._work_lock = threading.Lock()
+        self._work_queue = queue.SimpleQueue()
 
     def run(self):
         self._run_loop = Foundation.NSRunLoop.currentRunLoop()
+        self._ns_thread = Foundation.NSThread.currentThread()
+        # runMode:beforeDate: returns at once if the loop has no input
+        # sources; a port that never fires keeps it blocking until woken
+        self._run_loop.addPort_forMode_(Foundation.NSMachPort.port(),
+                                        Foundation.NSDefaultRunLoopMode)
         self._started_event.set()
         logger.debug("RunLoop thread started")
 
+        run_mode = self._run_loop.runMode_beforeDate_
+        mode = Foundation.NSDefaultRunLoopMode
+        forever = Foundation.NSDate.distantFuture()
         while not self._stop_event.is_set():
             pool = Foundation.NSAutoreleasePool.alloc().init()
-
-            # Process any queued work items
-            with self._work_lock:
-                while self._work_queue:
-                    work_item = self._work_queue.popleft()
-                    try:
-                        func, result_holder, done_event = work_item
-                        result_holder["result"] = func()
-                    except Exception as e:
-                        result_holder["error"] = e
-                    finally:
-                        done_event.set()
-
-            # Run the loop to process IOBluetooth callbacks
-            self._run_loop.runMode_beforeDate_(
-                Foundation.NSDefaultRunLoopMode,
-                Foundation.NSDate.dateWithTimeIntervalSinceNow_(0.05)
-            )
+            # Returns after handling an IOBluetooth callback or a wake-up
+            run_mode(mode, forever)
             del pool
 
         logger.debug("RunLoop thread stopped")
 
+    def _drain_work(self):
+        """Run queued work items (called on the RunLoop thread)."""
+        get_nowait = self._work_queue.get_nowait
+        while True:
+            try:
+                func, result_holder, done_event = get_nowait()
+            except queue.Empty:
+                return
+            if done_event is None:
+                # Fire-and-forget item from schedule()
+                try:
+                    func()
+                except Exception as e:
+                    logger.error(f"RunLoop work item failed: {e}")
+                continue
+            try:
+                result_holder["result"] = func()
+            except Exception as e:
+                result_holder["error"] = e
+            finally:
+                done_event.set()
+
+    def _wake(self):
+        """Wake the run loop and have it drain the work queue."""
+        if self._ns_thread is not None:
+            self._waker.performSelector_onThread_withObject_waitUntilDone_(
+                "drainWork:", self._ns_thread, None, False)
+
+    def schedule(self, func):
+        """Queue a callable to run on the RunLoop thread without waiting for it."""
+        self._work_queue.put((func, None, None))
+        self._wake()
+
     def schedule_and_wait(self, func, timeout=30.0):
         """
         Schedule a callable to run on the RunLoop thread and wait for it.
@@ -187,8 +434,8 @@ class _RunLoopThread(threading.Thread):
         """
         result_holder = {"result": None, "error": None}
         done_event = threading.Event()
-        with self._work_lock:
-            self._work_queue.append((func, result_holder, done_event))
+        self._work_queue.put((func, result_holder, done_event))
+        self._wake()
         if not done_event.wait(timeout):
             raise TimeoutError("Timed out waiting for RunLoop thread to execute work")
         if result_holder["error"] is not None:
@@ -197,6 +444,7 @@ class _RunLoopThread(threading.Thread):
 
     def stop(self):
         self._stop_event.set()
+        self._wake()  # let runMode:beforeDate: return so the loop sees the flag
 
     def wait_started(self, timeout=5.0):
         return self._started_event.wait(timeout)
@@ -232,10 +480,19 @@ class RFCOMMSerialBridge:
         self._write_timeout = write_timeout
         self._channel = None
         self._delegate = None
+        # Delegates of losing parallel-probe channels; IOBluetooth may still
+        # call them (late open / close callbacks), so they stay referenced
+        self._probe_delegates = []
         self._runloop_thread = None
         self._device = None
         self._is_open = False
 
+        # Outgoing bytes are coalesced here until flush() or a full MTU
+        self._tx_buf = bytearray()
+        self._tx_mtu = _DEFAULT_RFCOMM_MTU
+        self._tx_async = True  # cleared if writeAsync is unavailable
+        self._debug = False  # logger DEBUG state, sampled in open()
+
         # These are no-ops for RFCOMM but bioradio.py sets them
         self._dtr = False
         self._rts = False
@@ -287,16 +544,27 @@ class RFCOMMSerialBridge:
 
         logger.info("Performing SDP service discovery ...")
 
-        # SPP UUID: 00001101-0000-1000-8000-00805F9B34FB
-        spp_uuid = IOBluetooth.IOBluetoothSDPUUID.uuid16_(0x1101)
+        # Perform a fresh SDP query (clears cached results) on the RunLoop
+        # thread; the delegate's sdpQueryComplete_status_ signals completion
+        delegate = self._delegate
+        delegate._sdp_event.clear()
+        device = self._device
 
-        # Perform a fresh SDP query (clears cached results)
-        result = self._device.performSDPQuery_(None)
-        if result != 0:
-            logger.warning(f"SDP query returned error {result}, trying cached services")
+        def _sdp_query():
+            return device.performSDPQuery_(delegate)
 
-        # Give SDP query time to complete
-        time.sleep(2.0)
+        try:
+            result = self._runloop_thread.schedule_and_wait(_sdp_query, timeout=10.0)
+        except Exception as e:
+            logger.warning(f"SDP query failed to start ({e}), trying cached services")
+        else:
+            if result != 0:
+                logger.warning(f"SDP query returned error {result}, trying cached services")
+            elif not delegate._sdp_event.wait(timeout=5.0):
+                logger.warning("SDP query did not complete within 5 s, trying cached services")
+            elif delegate._sdp_status != 0:
+                logger.warning(f"SDP query completed with status {delegate._sdp_status}, "
+                               f"trying cached services")
 
         # Get all service records from the device
         services = self._device.services()
@@ -316,24 +584,16 @@ class RFCOMMSerialBridge:
             # Check if this service has an RFCOMM channel
             try:
                 # getRFCOMMChannelID_ returns (result, channel_id)
-                res, ch_id = svc.getRFCOMMChannelID_(None)
+                res, ch_id = _call_with_output(svc, "getRFCOMMChannelID_")
                 if res == 0:
                     discovered.append((ch_id, svc_name))
                     logger.info(f"  SDP service: '{svc_name}' -> RFCOMM channel {ch_id}")
-            except TypeError:
-                try:
-                    res, ch_id = svc.getRFCOMMChannelID_()
-                    if res == 0:
-                        discovered.append((ch_id, svc_name))
-                        logger.info(f"  SDP service: '{svc_name}' -> RFCOMM channel {ch_id}")
-                except Exception as e:
-                    logger.debug(f"  SDP service '{svc_name}': no RFCOMM channel ({e})")
             except Exception as e:
                 logger.debug(f"  SDP service '{svc_name}': error getting RFCOMM channel ({e})")
 
             # Also check if this service matches the SPP UUID
             try:
-                if svc.hasServiceFromArray_([spp_uuid]):
+                if svc.hasServiceFromArray_([_SPP_UUID]):
                     logger.info(f"  -> Service '{svc_name}' matches SPP UUID (0x1101)")
             except Exception:
                 pass
@@ -369,16 +629,7 @@ class RFCOMMSerialBridge:
         device = self._device
 
         def _do_open():
-            if use_async:
-                method = device.openRFCOMMChannelAsync_withChannelID_delegate_
-            else:
-                method = device.openRFCOMMChannelSync_withChannelID_delegate_
-            try:
-                result, channel = method(None, channel_id, delegate)
-            except TypeError:
-                # Older PyObjC may not pass the output parameter
-                result, channel = method(channel_id, delegate)
-            return (result, channel)
+            return _open_rfcomm_channel(device, channel_id, delegate, use_async)
 
         try:
             result, channel = self._runloop_thread.schedule_and_wait(_do_open, timeout=10.0)
@@ -388,6 +639,147 @@ class RFCOMMSerialBridge:
             logger.debug(f"  RFCOMM open ch={channel_id} {'async' if use_async else 'sync'} error: {e}")
             return -1
 
+    def _try_channel(self, ch_id: int) -> int:
+        """
+        Open one channel, sync first then async. On success (0) the
+        channel, delegate and channel ID are left set on self.
+        """
+        # Try synchronous open
+        self._delegate.reset()
+        result = self._try_open_rfcomm(ch_id, use_async=False)
+        if result == 0:
+            self._channel_id = ch_id
+            logger.info(f"  Channel {ch_id} (sync): opened, waiting for delegate ...")
+            # For sync, the channel should be open immediately
+            # but wait a bit for the delegate callback
+            self._delegate._open_event.wait(timeout=3.0)
+            if self._delegate._is_open:
+                logger.info(f"  Channel {ch_id} (sync): CONNECTED")
+            else:
+                logger.info(f"  Channel {ch_id} (sync): returned 0 but delegate not confirmed")
+                # Still might work — the sync call opened it
+                self._delegate._is_open = True
+            return 0
+
+        # Try asynchronous open
+        self._delegate.reset()
+        result = self._try_open_rfcomm(ch_id, use_async=True)
+        if result == 0:
+            logger.info(f"  Channel {ch_id} (async): initiated, waiting for callback ...")
+            # Wait for the async callback with longer timeout
+            self._delegate._open_event.wait(timeout=5.0)
+            if self._delegate._is_open:
+                self._channel_id = ch_id
+                logger.info(f"  Channel {ch_id} (async): CONNECTED")
+                return 0
+            elif self._delegate._open_error is not None:
+                logger.debug(f"  Channel {ch_id} (async): failed with {self._delegate._open_error}")
+                return self._delegate._open_error
+            else:
+                logger.debug(f"  Channel {ch_id} (async): no callback received")
+                return -1
+
+        logger.debug(f"  Channel {ch_id}: failed (error {result})")
+        return result
+
+    def _probe_channels_parallel(self, channel_ids: list, timeout: float = 5.0) -> int:
+        """
+        Start async opens on all channel_ids at once and keep the first one
+        that connects; the rest are closed. Bounded by one callback timeout
+        instead of one per channel.
+
+        Returns 0 (channel, delegate and channel ID set on self) or an
+        error code.
+        """
+        any_done = threading.Event()
+        # Each in-flight channel needs its own delegate so its callback can be
+        # told apart; the bridge's delegate is reused for the first one
+        delegates = {}
+        for i, ch_id in enumerate(channel_ids):
+            if i == 0:
+                delegate = self._delegate
+                delegate.reset()
+            else:
+                delegate = _RFCOMMDelegate.alloc().init()
+            delegate._any_open_event = any_done
+            delegates[ch_id] = delegate
+        device = self._device
+
+        def _open_all():
+            started = {}
+            for ch_id, delegate in delegates.items():
+                try:
+                    result, channel = _open_rfcomm_channel(device, ch_id, delegate, True)
+                except Exception as e:
+                    logger.debug(f"  Channel {ch_id} (async): error {e}")
+                    continue
+                if result == 0:
+                    started[ch_id] = channel
+                else:
+                    logger.debug(f"  Channel {ch_id} (async): failed (error {result})")
+            return started
+
+        try:
+            pending = self._runloop_thread.schedule_and_wait(_open_all, timeout=10.0)
+        except Exception as e:
+            logger.debug(f"  Parallel RFCOMM probe error: {e}")
+            self._retain_probe_delegates(delegates.values())
+            return -1
+        if not pending:
+            self._retain_probe_delegates(delegates.values())
+            return -1
+
+        logger.info(f"  Probing channels {sorted(pending)} in parallel ...")
+        deadline = time.monotonic() + timeout
+        winner = None
+        while True:
+            any_done.clear()
+            winner = next((ch for ch in pending if delegates[ch]._is_open), None)
+            if winner is not None or all(delegates[ch]._open_event.is_set() for ch in pending):
+                break
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            any_done.wait(remaining)
+
+        losers = [channel for ch_id, channel in pending.items()
+                  if ch_id != winner and channel is not None]
+
+        def _close_losers():
+            for channel in losers:
+                try:
+                    channel.closeChannel()
+                except Exception:
+                    pass
+
+        try:
+            self._runloop_thread.schedule_and_wait(_close_losers, timeout=5.0)
+        except Exception as e:
+            logger.debug(f"  Error closing probe channels: {e}")
+        self._retain_probe_delegates(
+            delegate for ch_id, delegate in delegates.items() if ch_id != winner)
+
+        if winner is None:
+            logger.debug("  Parallel probe: no channel connected")
+            return -1
+        logger.info(f"  Channel {winner} (async): CONNECTED")
+        self._channel_id = winner
+        self._delegate = delegates[winner]
+        self._channel = pending[winner]
+        return 0
+
+    def _retain_probe_delegates(self, delegates):
+        """
+        Keep probe delegates referenced until IOBluetooth is done with them,
+        dropping earlier ones whose channel has since failed or closed.
+        """
+        def finished(d):
+            return d._closed_event.is_set() or (d._open_event.is_set() and not d._is_open)
+
+        kept = [d for d in self._probe_delegates if not finished(d)]
+        kept.extend(delegates)
+        self._probe_delegates = kept
+
     # --- Connection ---
 
     def open(self, connect_timeout: float = 15.0) -> bool:
@@ -403,6 +795,7 @@ class RFCOMMSerialBridge:
             return True
 
         logger.info(f"Opening RFCOMM connection to {self._address}")
+        self._debug = logger.isEnabledFor(logging.DEBUG)
 
         # Start the run loop thread — ALL IOBluetooth calls must happen on this
         # thread so delegate callbacks are dispatched correctly
@@ -411,7 +804,8 @@ class RFCOMMSerialBridge:
         if not self._runloop_thread.wait_started(5.0):
             raise ConnectionError("Failed to start RunLoop thread")
 
-        # Create the delegate (must be retained for the lifetime of the connection)
+        # Create the delegate (must be retained for the lifetime of the
+        # connection); channel attempts reset() and reuse it
         self._delegate = _RFCOMMDelegate.alloc().init()
 
         # Get the Bluetooth device by address — this is safe from any thread
@@ -427,85 +821,51 @@ class RFCOMMSerialBridge:
         # Open baseband connection on the RunLoop thread
         if not self._device.isConnected():
             logger.info("Opening baseband connection ...")
+            delegate = self._delegate
+
             def _open_baseband():
-                return self._device.openConnection()
+                # Async open; the delegate's connectionComplete_status_ fires
+                return self._device.openConnection_(delegate)
             result = self._runloop_thread.schedule_and_wait(_open_baseband, timeout=10.0)
+            if result == 0:
+                if not delegate._connection_event.wait(timeout=10.0):
+                    raise ConnectionError(
+                        "Baseband connection timed out after 10s. "
+                        "Make sure the BioRadio is powered on and in range."
+                    )
+                result = delegate._connection_status
             if result != 0:
                 raise ConnectionError(
                     f"Failed to open baseband connection (error {result}). "
                     f"Make sure the BioRadio is powered on and in range."
                 )
-            time.sleep(1.0)
 
-        # Step 1: SDP discovery on the RunLoop thread
-        def _sdp_query():
-            return self._device.performSDPQuery_(None)
-        logger.info("Performing SDP query ...")
-        sdp_result = self._runloop_thread.schedule_and_wait(_sdp_query, timeout=10.0)
-        logger.info(f"SDP query result: {sdp_result}")
-        time.sleep(2.0)
-
-        # Check SDP services for RFCOMM channel
+        # Step 1: SDP discovery — check SDP services for RFCOMM channels
         sdp_channels = self._perform_sdp_query()
 
-        # Build channel list: SDP-discovered first, then user-specified, then 1-30
-        channels_to_try = []
-        for ch_id, svc_name in sdp_channels:
-            channels_to_try.append(ch_id)
-        if self._channel_id not in channels_to_try:
-            channels_to_try.append(self._channel_id)
-        for ch in range(1, 31):
-            if ch not in channels_to_try:
-                channels_to_try.append(ch)
-
-        logger.info(f"Will try {len(channels_to_try)} channels")
+        # Step 2: SDP-discovered channels first, then the user-specified one,
+        # each tried sync + async on the RunLoop thread
+        preferred = [ch_id for ch_id, svc_name in sdp_channels]
+        if self._channel_id not in preferred:
+            preferred.append(self._channel_id)
 
-        # Step 2: Try each channel — both sync and async, all on RunLoop thread
+        logger.info(f"Trying channels {preferred}")
         result = -1
-        for ch_id in channels_to_try:
-            # Try synchronous open
-            self._delegate = _RFCOMMDelegate.alloc().init()
-            result = self._try_open_rfcomm(ch_id, use_async=False)
+        for ch_id in preferred:
+            result = self._try_channel(ch_id)
             if result == 0:
-                self._channel_id = ch_id
-                logger.info(f"  Channel {ch_id} (sync): opened, waiting for delegate ...")
-                # For sync, the channel should be open immediately
-                # but wait a bit for the delegate callback
-                self._delegate._open_event.wait(timeout=3.0)
-                if self._delegate._is_open:
-                    logger.info(f"  Channel {ch_id} (sync): CONNECTED")
-                    break
-                else:
-                    logger.info(f"  Channel {ch_id} (sync): returned 0 but delegate not confirmed")
-                    # Still might work — the sync call opened it
-                    self._delegate._is_open = True
-                    break
+                break
 
-            # Try asynchronous open
-            self._delegate = _RFCOMMDelegate.alloc().init()
-            result = self._try_open_rfcomm(ch_id, use_async=True)
-            if result == 0:
-                logger.info(f"  Channel {ch_id} (async): initiated, waiting for callback ...")
-                # Wait for the async callback with longer timeout
-                self._delegate._open_event.wait(timeout=5.0)
-                if self._delegate._is_open:
-                    self._channel_id = ch_id
-                    logger.info(f"  Channel {ch_id} (async): CONNECTED")
-                    break
-                elif self._delegate._open_error is not None:
-                    logger.debug(f"  Channel {ch_id} (async): failed with {self._delegate._open_error}")
-                    result = self._delegate._open_error
-                else:
-                    logger.debug(f"  Channel {ch_id} (async): no callback received")
-                    result = -1
-            else:
-                logger.debug(f"  Channel {ch_id}: failed (error {result})")
+        # Step 3: fall back to probing every other channel 1-30 at once
+        if result != 0:
+            others = [ch for ch in range(1, 31) if ch not in preferred]
+            result = self._probe_channels_parallel(others)
 
         if result != 0 and not self._delegate._is_open:
             raise ConnectionError(
                 f"Failed to open RFCOMM channel (last error {result}).\n"
                 f"SDP discovered channels: {sdp_channels}\n"
-                f"Tried channels: 1-30 (sync + async on RunLoop thread)\n\n"
+                f"Tried channels: {preferred} (sync + async), then 1-30 in parallel (async)\n\n"
                 f"The BioRadio advertises SPP UUID (0x1101) but the RFCOMM\n"
                 f"connection cannot be established from macOS.\n\n"
                 f"Possible workarounds:\n"
@@ -530,8 +890,14 @@ class RFCOMMSerialBridge:
                 f"RFCOMM channel open failed with error: {self._delegate._open_error}"
             )
 
+        try:
+            self._tx_mtu = int(self._channel.getMTU()) or _DEFAULT_RFCOMM_MTU
+        except Exception as e:
+            logger.debug(f"Could not read RFCOMM MTU, using {_DEFAULT_RFCOMM_MTU}: {e}")
+
         self._is_open = True
-        logger.info(f"RFCOMM channel {self._channel_id} open to {self._device.name()}")
+        logger.info(f"RFCOMM channel {self._channel_id} open to {self._device.name()} "
+                    f"(MTU {self._tx_mtu})")
         return True
 
     # --- serial.Serial-compatible I/O methods ---
@@ -544,65 +910,218 @@ class RFCOMMSerialBridge:
         if not self.is_open:
             return b""
 
-        deadline = time.monotonic() + (self._timeout or 0)
-        result = bytearray()
+        delegate = self._delegate
 
-        while len(result) < size:
-            # Check buffer
-            available = self._delegate.read_bytes(size - len(result))
-            if available:
-                result.extend(available)
-                if len(result) >= size:
+        # Fast path: everything asked for is already buffered
+        if delegate._tail - delegate._head >= size:
+            return delegate.read_bytes(size)
+
+        read_bytes = delegate.read_bytes
+        data_event = delegate._data_event
+        monotonic = time.monotonic
+        timeout = self._timeout
+        deadline = None if timeout is None else monotonic() + timeout
+        # Chunks are kept as-is and joined once at the end instead of being
+        # copied into a growing accumulator on every wake-up
+        parts = []
+        need = size
+        chunk = read_bytes(need)
+        if chunk:
+            parts.append(chunk)
+            need -= len(chunk)
+
+        # The delegate sets data_event after storing each packet and on close.
+        # read_bytes() clears it only after draining the ring, then re-checks
+        # head != tail, so a packet landing at any point leaves it set and an
+        # un-sliced wait can't sleep past buffered data
+        while True:
+            if deadline is None:
+                data_event.wait()
+            else:
+                remaining = deadline - monotonic()
+                if remaining <= 0:
                     break
+                data_event.wait(remaining)
 
-            # If we have some data and timeout is set, return what we have
-            if result and self._timeout is not None:
-                remaining = deadline - time.monotonic()
-                if remaining <= 0:
+            chunk = read_bytes(need)
+            if chunk:
+                parts.append(chunk)
+                need -= len(chunk)
+                if need <= 0:
                     break
+            elif not delegate._is_open:
+                break
+
+        if len(parts) == 1:
+            return parts[0]
+        return b"".join(parts)
+
+    def read_into(self, buf, offset: int = 0, size: Optional[int] = None) -> int:
+        """
+        Read up to `size` bytes into buf[offset:offset+size], blocking up to
+        self.timeout seconds like read(). `size` defaults to the rest of buf.
+
+        Returns the number of bytes copied (0 on timeout).
+        """
+        if size is None:
+            size = len(buf) - offset
+        if not self.is_open:
+            return 0
 
-            # Wait for more data
-            if self._timeout is None:
-                # Blocking forever
-                self._delegate._data_event.wait(0.1)
+        delegate = self._delegate
+        read_into = delegate.read_into
+        got = read_into(buf, offset, size)
+        if got >= size:
+            return got
+
+        data_event = delegate._data_event
+        monotonic = time.monotonic
+        timeout = self._timeout
+        deadline = None if timeout is None else monotonic() + timeout
+
+        # Same wake-up rules as read()
+        while True:
+            if deadline is None:
+                data_event.wait()
             else:
-                remaining = deadline - time.monotonic()
+                remaining = deadline - monotonic()
                 if remaining <= 0:
                     break
-                self._delegate._data_event.wait(min(0.1, remaining))
+                data_event.wait(remaining)
+
+            n = read_into(buf, offset + got, size - got)
+            if n:
+                got += n
+                if got >= size:
+                    break
+            elif not delegate._is_open:
+                break
 
-        return bytes(result)
+        return got
 
     def write(self, data: bytes) -> int:
-        """Write data to the RFCOMM channel."""
+        """
+        Queue data for the RFCOMM channel.
+
+        Writes are coalesced and sent by flush() (or once a full MTU is
+        queued), so a packet written in pieces still goes out as one RFCOMM
+        frame. Like serial.Serial, the bridge is written from one thread;
+        read() never touches the TX buffer, so a reader thread is safe.
+        """
         if not self.is_open or self._channel is None:
             raise IOError("RFCOMM channel is not open")
 
-        # Convert to NSData for IOBluetooth
-        ns_data = Foundation.NSData.alloc().initWithBytes_length_(data, len(data))
+        self._tx_buf += data
+        if len(self._tx_buf) >= self._tx_mtu:
+            self._flush_tx()
+        return len(data)
+
+    def _flush_tx(self):
+        """Send all queued bytes in MTU-sized frames."""
+        buf, self._tx_buf = self._tx_buf, bytearray()
+        mtu = self._tx_mtu
+        for start in range(0, len(buf), mtu):
+            self._send(bytes(buf[start:start + mtu]))
+
+    def _send(self, data: bytes):
+        """
+        Write one frame to the channel.
+
+        Frames go out with writeAsync on the RunLoop thread, with up to
+        _MAX_TX_IN_FLIGHT unacknowledged at once; this only blocks while
+        that many are still in flight.
+        """
+        if not self._tx_async:
+            self._send_sync(data)
+            return
+
+        delegate = self._delegate
+        in_flight = delegate._tx_in_flight
+        with delegate._tx_cond:
+            if not delegate._tx_cond.wait_for(
+                    lambda: len(in_flight) < _MAX_TX_IN_FLIGHT, self._write_timeout):
+                raise IOError("RFCOMM write timed out waiting for earlier frames to send")
+            self._raise_tx_error()
+            in_flight.append(data)
+
+        channel = self._channel
+
+        def _write():
+            try:
+                result = channel.writeAsync_length_refcon_(data, len(data), None)
+            except (AttributeError, TypeError) as e:
+                # No usable writeAsync in this PyObjC: send this and later
+                # frames synchronously (no completion callback for those)
+                logger.warning(f"RFCOMM writeAsync unavailable ({e}), using writeSync")
+                self._tx_async = False
+                result = channel.writeSync_length_(data, len(data))
+                delegate._tx_done(result, data)
+                return
+            if result != 0:
+                logger.error(f"RFCOMM async write failed with error: {result}")
+                delegate._tx_done(result, data)
+
+        self._runloop_thread.schedule(_write)
 
-        # writeSync blocks until the data is sent
+        if self._debug:
+            logger.debug(f"RFCOMM TX: {len(data)} bytes: {data.hex(' ')}")
+
+    def _raise_tx_error(self):
+        """Raise (once) a failure reported for an earlier async write."""
+        delegate = self._delegate
+        error = delegate._tx_error
+        if error is not None:
+            delegate._tx_error = None
+            raise IOError(f"RFCOMM write failed (error {error})")
+
+    def _wait_tx_drained(self):
+        """Block until every async write has completed."""
+        delegate = self._delegate
+        in_flight = delegate._tx_in_flight
+        with delegate._tx_cond:
+            if not delegate._tx_cond.wait_for(lambda: not in_flight, self._write_timeout):
+                raise IOError("RFCOMM write timed out")
+            self._raise_tx_error()
+
+    def _send_sync(self, data: bytes):
+        """Write one frame with writeSync (blocks until the data is sent)."""
         result = self._channel.writeSync_length_(data, len(data))
 
         if result != 0:
             logger.error(f"RFCOMM write failed with error: {result}")
             # Try NSData approach as fallback
             try:
+                ns_data = Foundation.NSData.alloc().initWithBytes_length_(data, len(data))
                 result = self._channel.writeData_(ns_data)
                 if result != 0:
                     raise IOError(f"RFCOMM write failed (error {result})")
             except Exception:
                 raise IOError(f"RFCOMM write failed (error {result})")
 
-        logger.debug(f"RFCOMM TX: {len(data)} bytes: {data.hex(' ')}")
-        return len(data)
+        if self._debug:
+            logger.debug(f"RFCOMM TX: {len(data)} bytes: {data.hex(' ')}")
 
     def flush(self):
-        """Flush write buffer. No-op for RFCOMM (writes are synchronous)."""
-        pass
+        """Send any queued write data and wait until the channel has sent it."""
+        if not self.is_open or self._channel is None:
+            if self._tx_buf:
+                raise IOError("RFCOMM channel is not open")
+            return
+        if self._tx_buf:
+            self._flush_tx()
+        self._wait_tx_drained()
 
     def close(self):
         """Close the RFCOMM channel and clean up."""
+        if self.is_open:
+            try:
+                if self._tx_buf:
+                    self._flush_tx()
+                self._wait_tx_drained()
+            except Exception as e:
+                logger.debug(f"Error flushing pending writes: {e}")
+        self._tx_buf = bytearray()
+
         if self._channel is not None:
             try:
                 self._channel.closeChannel()
@@ -624,6 +1143,8 @@ class RFCOMMSerialBridge:
 
         self._is_open = False
         self._delegate = None
+        # The RunLoop thread is gone, so no more callbacks can reach these
+        self._probe_delegates = []
         logger.info("RFCOMM bridge closed")
 
     def __enter__(self):
@@ -720,9 +1241,6 @@ def sdp_discover(address: str):
 
     print(f"\n  Found {len(services)} SDP service(s):\n")
 
-    spp_uuid = IOBluetooth.IOBluetoothSDPUUID.uuid16_(0x1101)
-    rfcomm_uuid = IOBluetooth.IOBluetoothSDPUUID.uuid16_(0x0003)
-
     for i, svc in enumerate(services):
         svc_name = "unnamed"
         try:
@@ -737,18 +1255,10 @@ def sdp_discover(address: str):
         # Check for RFCOMM channel
         has_rfcomm = False
         try:
-            res, ch_id = svc.getRFCOMMChannelID_(None)
+            res, ch_id = _call_with_output(svc, "getRFCOMMChannelID_")
             if res == 0:
                 print(f"      RFCOMM channel: {ch_id}")
                 has_rfcomm = True
-        except TypeError:
-            try:
-                res, ch_id = svc.getRFCOMMChannelID_()
-                if res == 0:
-                    print(f"      RFCOMM channel: {ch_id}")
-                    has_rfcomm = True
-            except Exception:
-                pass
         except Exception:
             pass
 
@@ -757,7 +1267,7 @@ def sdp_discover(address: str):
 
         # Check for L2CAP PSM
         try:
-            res, psm = svc.getL2CAPPSM_(None)
+            res, psm = _call_with_output(svc, "getL2CAPPSM_")
             if res == 0:
                 print(f"      L2CAP PSM: {psm}")
         except Exception:
@@ -765,7 +1275,7 @@ def sdp_discover(address: str):
 
         # Check if it matches SPP UUID
         try:
-            if svc.hasServiceFromArray_([spp_uuid]):
+            if svc.hasServiceFromArray_([_SPP_UUID]):
                 print(f"      ** Matches SPP UUID (0x1101) **")
         except Exception:
             pass
@@ -849,6 +1359,7 @@ if __name__ == "__main__":
     print(f"\n[3] Sending firmware query: {CMD_GET_FIRMWARE.hex(' ')}")
 
     bridge.write(CMD_GET_FIRMWARE)
+    bridge.flush()
     time.sleep(0.5)
 
     print(f"  Bytes waiting: {bridge.in_waiting}")
@@ -863,6 +1374,7 @@ if __name__ == "__main__":
         for i in range(3):
             print(f"\n  Retry {i+1}/3 ...")
             bridge.write(CMD_GET_FIRMWARE)
+            bridge.flush()
             time.sleep(1.0)
             response = bridge.read(64)
             if response: